@@ -12,6 +12,11 @@ with json_path.open("r", encoding="utf-8") as f:
     farmers = json.load(f)
 
 conn = sqlite3.connect(db_path)
+# One-shot seeding: trade durability for speed, then restore WAL at the end.
+conn.execute("PRAGMA journal_mode=MEMORY")
+conn.execute("PRAGMA synchronous=OFF")
+conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+conn.execute("PRAGMA temp_store=MEMORY")
 cur = conn.cursor()
 
 cur.execute(
@@ -62,36 +67,63 @@ cur.execute(
     """
 )
 
-cur.execute("DELETE FROM farmers")
-cur.executemany(
+# Change counter read by db.farmers_version(); same schema as db.init_db.
+cur.execute(
+    """
+    CREATE TABLE IF NOT EXISTS farmers_version (
+        id INTEGER PRIMARY KEY CHECK (id = 0),
+        version INTEGER NOT NULL
+    )
     """
-    INSERT INTO farmers (
-        id, name, name_en, phone, village, district, state,
-        account_number, ifsc_code, bank_name, survey_number,
-        area_acres, enrolled_date
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-    [
-        (
-            f.get("id"),
-            f.get("name"),
-            f.get("name_en"),
-            f.get("phone"),
-            f.get("village"),
-            f.get("district"),
-            f.get("state"),
-            f.get("account_number"),
-            f.get("ifsc_code"),
-            f.get("bank_name"),
-            f.get("survey_number"),
-            f.get("area_acres"),
-            f.get("enrolled_date"),
-        )
-        for f in farmers
-    ],
 )
-
+cur.execute("INSERT OR IGNORE INTO farmers_version (id, version) VALUES (0, 0)")
 conn.commit()
+
+FARMER_COLUMNS = (
+    "id", "name", "name_en", "phone", "village", "district", "state",
+    "account_number", "ifsc_code", "bank_name", "survey_number",
+    "area_acres", "enrolled_date",
+)
+BATCH_SIZE = 500  # 500 rows x 13 columns stays well under SQLite's variable limit
+row_placeholder = "(" + ", ".join("?" * len(FARMER_COLUMNS)) + ")"
+# Secondary indexes (same names as db.init_db) are rebuilt once after the load
+# instead of being maintained row by row.
+INDEXED_COLUMNS = ("account_number", "ifsc_code", "phone", "survey_number", "name_en")
+# Likewise the per-row farmers_version triggers are dropped for the load and
+# the version is bumped once at the end.
+VERSION_EVENTS = ("INSERT", "UPDATE", "DELETE")
+
+with conn:
+    # sqlite3 does not open a transaction before DDL on its own, so begin one
+    # explicitly; otherwise a failed load would leave the indexes dropped.
+    cur.execute("BEGIN")
+    for column in INDEXED_COLUMNS:
+        cur.execute(f"DROP INDEX IF EXISTS idx_farmers_{column}")
+    for event in VERSION_EVENTS:
+        cur.execute(f"DROP TRIGGER IF EXISTS farmers_version_{event.lower()}")
+    cur.execute("DELETE FROM farmers")
+    for start in range(0, len(farmers), BATCH_SIZE):
+        batch = farmers[start:start + BATCH_SIZE]
+        cur.execute(
+            f"INSERT INTO farmers ({', '.join(FARMER_COLUMNS)}) VALUES "
+            + ", ".join([row_placeholder] * len(batch)),
+            [f.get(column) for f in batch for column in FARMER_COLUMNS],
+        )
+    for column in INDEXED_COLUMNS:
+        cur.execute(f"CREATE INDEX idx_farmers_{column} ON farmers({column})")
+    for event in VERSION_EVENTS:
+        cur.execute(
+            f"""
+            CREATE TRIGGER farmers_version_{event.lower()}
+            AFTER {event} ON farmers
+            BEGIN
+                UPDATE farmers_version SET version = version + 1 WHERE id = 0;
+            END
+            """
+        )
+    cur.execute("UPDATE farmers_version SET version = version + 1 WHERE id = 0")
+
+conn.execute("PRAGMA journal_mode=WAL")
 conn.close()
 
 print(f"SQLite DB created at: {db_path}")
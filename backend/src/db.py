@@ -1,23 +1,83 @@
+import functools
 import json
 import sqlite3
-from datetime import datetime
+import threading
+import time
+import weakref
 from pathlib import Path
 from typing import Optional
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 def _db_path() -> str:
     default_path = Path(__file__).resolve().parents[1] / "data" / "farmers.db"
     return str(default_path)
 
 
+_local = threading.local()
+
+
+class _ThreadConnections:
+    """One thread's connections by path. Held only by that thread's local
+    storage, so it is collected (closing them) when the thread exits."""
+
+    def __init__(self) -> None:
+        self.by_path: dict[str, sqlite3.Connection] = {}
+        # Also runs at interpreter exit for threads still alive then.
+        weakref.finalize(self, _close_connections, self.by_path)
+
+
+def _close_connections(by_path: dict) -> None:
+    for conn in by_path.values():
+        conn.close()
+    by_path.clear()
+
+
 def _connect(db_path: Optional[str] = None) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path or _db_path())
+    """Return this thread's cached connection for db_path, opening it on first use."""
+    path = db_path or _db_path()
+    holder = getattr(_local, "connections", None)
+    if holder is None:
+        holder = _local.connections = _ThreadConnections()
+    conn = holder.by_path.get(path)
+    if conn is None:
+        conn = holder.by_path[path] = _open(path)
+    return conn
+
+
+def _open(path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so a connection can be closed from
+    # whichever thread finalizes its owner (or at exit); each connection is
+    # otherwise used by one thread.
+    # Autocommit (isolation_level=None) so a failed write never leaves a
+    # transaction open on the reused connection.
+    conn = sqlite3.connect(
+        path, isolation_level=None, check_same_thread=False, cached_statements=256
+    )
     conn.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode=WAL is persistent and set in init_db.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA busy_timeout=30000")
     return conn
 
 
+# Identifier columns that validation looks farmers up by (each is indexed).
+_FARMER_LOOKUP_COLUMNS = ("account_number", "ifsc_code", "phone", "survey_number")
+
+
 def init_db(db_path: Optional[str] = None) -> None:
-    conn = _connect(db_path)
+    path = db_path or _db_path()
+    conn = _connect(path)
+    if path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
     cur = conn.cursor()
     cur.execute(
         """
@@ -64,28 +124,166 @@ def init_db(db_path: Optional[str] = None) -> None:
         )
         """
     )
-    conn.commit()
-    conn.close()
+    for column in _FARMER_LOOKUP_COLUMNS + ("name_en",):
+        cur.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_farmers_{column} ON farmers({column})"
+        )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_documents_farmer ON documents(farmer_id, id DESC)"
+    )
+    # Counter bumped by every write to farmers, from any connection or
+    # process, so readers can cache the table until it changes.
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS farmers_version (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            version INTEGER NOT NULL
+        )
+        """
+    )
+    cur.execute("INSERT OR IGNORE INTO farmers_version (id, version) VALUES (0, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cur.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS farmers_version_{event.lower()}
+            AFTER {event} ON farmers
+            BEGIN
+                UPDATE farmers_version SET version = version + 1 WHERE id = 0;
+            END
+            """
+        )
+
+
+_DOC_COLUMNS = ("id", "farmer_id", "filename", "status", "metadata", "created_at")
+_DOC_COLUMN_LIST = ", ".join(_DOC_COLUMNS)
+_DOC_SELECT = f"SELECT {_DOC_COLUMN_LIST} FROM documents"
+
+
+# Columns that update_farmer/update_document may set; anything else is rejected
+# before it can reach the generated SQL.
+_FARMER_UPDATE_COLUMNS = frozenset((
+    "name", "name_en", "phone", "village", "district", "state",
+    "account_number", "ifsc_code", "bank_name", "survey_number",
+    "area_acres", "enrolled_date",
+))
+_DOC_UPDATE_COLUMNS = frozenset(("farmer_id", "filename", "status", "metadata"))
+
+
+def _check_update_columns(updates: dict, allowed: frozenset) -> tuple[str, ...]:
+    unknown = updates.keys() - allowed
+    if unknown:
+        raise ValueError(f"Cannot update column(s): {', '.join(sorted(unknown))}")
+    return tuple(sorted(updates))
+
+
+@functools.lru_cache(maxsize=64)
+def _update_sql(table: str, key: str, columns: tuple[str, ...], returning: str) -> str:
+    # Same update shape -> identical SQL text -> hit in the statement cache.
+    fields = ", ".join(f"{c} = ?" for c in columns)
+    return f"UPDATE {table} SET {fields} WHERE {key} = ? RETURNING {returning}"
+
+
+_WRITE_RETRY_DELAYS = (0.01, 0.05, 0.25)
+
+
+def _retry_on_busy(func):
+    """Retry a write when SQLite still reports the database locked/busy after busy_timeout."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for delay in _WRITE_RETRY_DELAYS:
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.OperationalError as exc:
+                message = str(exc).lower()
+                if "locked" not in message and "busy" not in message:
+                    raise
+            time.sleep(delay)
+        return func(*args, **kwargs)
+    return wrapper
+
+
+_iso_second: tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """UTC timestamp in datetime.isoformat() layout, formatting the seconds part once per second."""
+    global _iso_second
+    secs, rem = divmod(time.time_ns(), 1_000_000_000)
+    cached_secs, prefix = _iso_second
+    if cached_secs != secs:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs))
+        _iso_second = (secs, prefix)
+    return f"{prefix}.{rem // 1000:06d}"
 
 
 def _row_to_dict(row: sqlite3.Row) -> dict:
-    return {k: row[k] for k in row.keys()}
+    return dict(row)
 
 
-def list_farmers() -> list[dict]:
-    conn = _connect()
-    rows = conn.execute("SELECT * FROM farmers ORDER BY id").fetchall()
-    conn.close()
-    return [_row_to_dict(r) for r in rows]
+def _fetch_dicts(conn: sqlite3.Connection, sql: str, params=()) -> list[dict]:
+    """Run a query over plain tuples, reading column names once from the cursor."""
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(sql, params)
+    columns = [d[0] for d in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def farmers_version(db_path: Optional[str] = None) -> Optional[int]:
+    """Return a counter that changes whenever farmers is written, or None
+    if the database was not set up by init_db."""
+    try:
+        row = _connect(db_path).execute(
+            "SELECT version FROM farmers_version WHERE id = 0"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+def list_farmers(db_path: Optional[str] = None) -> list[dict]:
+    return _fetch_dicts(_connect(db_path), "SELECT * FROM farmers ORDER BY id")
+
+
+def find_farmers(criteria: dict, db_path: Optional[str] = None) -> list[dict]:
+    """Return farmers matching any of the given identifier columns exactly."""
+    columns = tuple(c for c in _FARMER_LOOKUP_COLUMNS if criteria.get(c))
+    if not columns:
+        return []
+    where = " OR ".join(f"{c} = ?" for c in columns)
+    return _fetch_dicts(
+        _connect(db_path),
+        f"SELECT * FROM farmers WHERE {where} ORDER BY id",
+        [criteria[c] for c in columns],
+    )
+
+
+def find_farmers_in(column: str, values, db_path: Optional[str] = None) -> list[dict]:
+    """Return farmers whose identifier column equals any of values, by id."""
+    if column not in _FARMER_LOOKUP_COLUMNS:
+        raise ValueError(f"Not a lookup column: {column}")
+    values = list(dict.fromkeys(v for v in values if v))
+    conn = _connect(db_path)
+    rows = []
+    # Stay well under SQLite's host-parameter limit.
+    for start in range(0, len(values), 500):
+        chunk = values[start:start + 500]
+        rows.extend(_fetch_dicts(
+            conn,
+            f"SELECT * FROM farmers WHERE {column} IN ({', '.join('?' * len(chunk))})",
+            chunk,
+        ))
+    rows.sort(key=lambda row: row["id"])
+    return rows
 
 
 def get_farmer(farmer_id: str) -> Optional[dict]:
     conn = _connect()
     row = conn.execute("SELECT * FROM farmers WHERE id = ?", (farmer_id,)).fetchone()
-    conn.close()
     return _row_to_dict(row) if row else None
 
 
+@_retry_on_busy
 def create_farmer(payload: dict) -> dict:
     conn = _connect()
     cur = conn.cursor()
@@ -96,6 +294,7 @@ def create_farmer(payload: dict) -> dict:
             account_number, ifsc_code, bank_name, survey_number,
             area_acres, enrolled_date
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        RETURNING *
         """,
         (
             payload.get("id"),
@@ -113,43 +312,39 @@ def create_farmer(payload: dict) -> dict:
             payload.get("enrolled_date"),
         ),
     )
-    conn.commit()
-    farmer = get_farmer(payload.get("id"))
-    conn.close()
-    return farmer
+    # fetchall() steps the statement to completion so the write is finalized.
+    return _row_to_dict(cur.fetchall()[0])
 
 
+@_retry_on_busy
 def update_farmer(farmer_id: str, updates: dict) -> Optional[dict]:
     if not updates:
         return get_farmer(farmer_id)
-    fields = ", ".join([f"{k} = ?" for k in updates.keys()])
-    values = list(updates.values()) + [farmer_id]
+    columns = _check_update_columns(updates, _FARMER_UPDATE_COLUMNS)
+    values = [updates[c] for c in columns] + [farmer_id]
     conn = _connect()
     cur = conn.cursor()
-    cur.execute(f"UPDATE farmers SET {fields} WHERE id = ?", values)
-    conn.commit()
-    farmer = get_farmer(farmer_id)
-    conn.close()
-    return farmer
+    cur.execute(_update_sql("farmers", "id", columns, "*"), values)
+    rows = cur.fetchall()
+    return _row_to_dict(rows[0]) if rows else None
 
 
+@_retry_on_busy
 def delete_farmer(farmer_id: str) -> bool:
     conn = _connect()
     cur = conn.cursor()
     cur.execute("DELETE FROM farmers WHERE id = ?", (farmer_id,))
-    conn.commit()
     deleted = cur.rowcount > 0
-    conn.close()
     return deleted
 
 
 def get_profile(farmer_id: str) -> Optional[dict]:
     conn = _connect()
     row = conn.execute("SELECT * FROM profiles WHERE farmer_id = ?", (farmer_id,)).fetchone()
-    conn.close()
     return _row_to_dict(row) if row else None
 
 
+@_retry_on_busy
 def upsert_profile(payload: dict) -> dict:
     conn = _connect()
     cur = conn.cursor()
@@ -163,6 +358,7 @@ def upsert_profile(payload: dict) -> dict:
             address = excluded.address,
             offline_enabled = excluded.offline_enabled,
             updated_at = excluded.updated_at
+        RETURNING *
         """,
         (
             payload.get("farmer_id"),
@@ -170,99 +366,89 @@ def upsert_profile(payload: dict) -> dict:
             payload.get("phone"),
             payload.get("address"),
             1 if payload.get("offline_enabled") else 0,
-            datetime.utcnow().isoformat(),
+            _utc_now_iso(),
         ),
     )
-    conn.commit()
-    profile = get_profile(payload.get("farmer_id"))
-    conn.close()
-    return profile
+    return _row_to_dict(cur.fetchall()[0])
 
 
+@_retry_on_busy
 def delete_profile(farmer_id: str) -> bool:
     conn = _connect()
     cur = conn.cursor()
     cur.execute("DELETE FROM profiles WHERE farmer_id = ?", (farmer_id,))
-    conn.commit()
     deleted = cur.rowcount > 0
-    conn.close()
     return deleted
 
 
+def _doc_from_row(row: tuple) -> dict:
+    doc = dict(zip(_DOC_COLUMNS, row))
+    if doc["metadata"]:
+        doc["metadata"] = _json_loads(doc["metadata"])
+    return doc
+
+
 def list_documents(farmer_id: Optional[str] = None) -> list[dict]:
-    conn = _connect()
+    cur = _connect().cursor()
+    cur.row_factory = None
     if farmer_id:
-        rows = conn.execute(
-            "SELECT * FROM documents WHERE farmer_id = ? ORDER BY id DESC",
+        cur.execute(
+            f"{_DOC_SELECT} WHERE farmer_id = ? ORDER BY id DESC",
             (farmer_id,),
-        ).fetchall()
+        )
     else:
-        rows = conn.execute("SELECT * FROM documents ORDER BY id DESC").fetchall()
-    conn.close()
-    documents = []
-    for row in rows:
-        doc = _row_to_dict(row)
-        if doc.get("metadata"):
-            doc["metadata"] = json.loads(doc["metadata"])
-        documents.append(doc)
-    return documents
+        cur.execute(f"{_DOC_SELECT} ORDER BY id DESC")
+    return [_doc_from_row(row) for row in cur.fetchall()]
 
 
 def get_document(doc_id: int) -> Optional[dict]:
-    conn = _connect()
-    row = conn.execute("SELECT * FROM documents WHERE id = ?", (doc_id,)).fetchone()
-    conn.close()
-    if not row:
-        return None
-    doc = _row_to_dict(row)
-    if doc.get("metadata"):
-        doc["metadata"] = json.loads(doc["metadata"])
-    return doc
+    cur = _connect().cursor()
+    cur.row_factory = None
+    row = cur.execute(f"{_DOC_SELECT} WHERE id = ?", (doc_id,)).fetchone()
+    return _doc_from_row(row) if row else None
 
 
+@_retry_on_busy
 def create_document(payload: dict) -> dict:
-    conn = _connect()
-    cur = conn.cursor()
+    cur = _connect().cursor()
+    cur.row_factory = None
     cur.execute(
-        """
+        f"""
         INSERT INTO documents (farmer_id, filename, status, metadata, created_at)
         VALUES (?, ?, ?, ?, ?)
+        RETURNING {_DOC_COLUMN_LIST}
         """,
         (
             payload.get("farmer_id"),
             payload.get("filename"),
             payload.get("status", "pending"),
             json.dumps(payload.get("metadata")) if payload.get("metadata") else None,
-            datetime.utcnow().isoformat(),
+            _utc_now_iso(),
         ),
     )
-    conn.commit()
-    doc_id = cur.lastrowid
-    conn.close()
-    return get_document(doc_id)
+    return _doc_from_row(cur.fetchall()[0])
 
 
+@_retry_on_busy
 def update_document(doc_id: int, updates: dict) -> Optional[dict]:
     if not updates:
         return get_document(doc_id)
     if "metadata" in updates and updates["metadata"] is not None:
-        updates["metadata"] = json.dumps(updates["metadata"])
-    fields = ", ".join([f"{k} = ?" for k in updates.keys()])
-    values = list(updates.values()) + [doc_id]
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(f"UPDATE documents SET {fields} WHERE id = ?", values)
-    conn.commit()
-    doc = get_document(doc_id)
-    conn.close()
-    return doc
-
-
+        # Copy rather than mutate so a retried call sees the caller's dict.
+        updates = {**updates, "metadata": json.dumps(updates["metadata"])}
+    columns = _check_update_columns(updates, _DOC_UPDATE_COLUMNS)
+    values = [updates[c] for c in columns] + [doc_id]
+    cur = _connect().cursor()
+    cur.row_factory = None
+    cur.execute(_update_sql("documents", "id", columns, _DOC_COLUMN_LIST), values)
+    rows = cur.fetchall()
+    return _doc_from_row(rows[0]) if rows else None
+
+
+@_retry_on_busy
 def delete_document(doc_id: int) -> bool:
     conn = _connect()
     cur = conn.cursor()
     cur.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
-    conn.commit()
     deleted = cur.rowcount > 0
-    conn.close()
     return deleted
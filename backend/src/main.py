@@ -3,22 +3,29 @@ Farmers for Forests - Document Verification API
 Main FastAPI application.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
 import mimetypes
-import tempfile
+import uuid
+from collections import OrderedDict
 from typing import Optional, List
 from pathlib import Path
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends
+import anyio
+from fastapi import FastAPI, UploadFile, File, HTTPException, Header, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
-from quality_assessment import assess_quality, QualityReport
+from quality_assessment import assess_quality_bytes, QualityReport
 from ocr_pipeline import OCRPipeline, OCRResult
 from validation_engine import ValidationEngine, ValidationResult
 from db import (
     init_db,
+    farmers_version,
     list_farmers,
     get_farmer,
     create_farmer,
@@ -40,12 +47,16 @@ USE_TESSERACT = os.getenv("USE_TESSERACT", "false").lower() == "true"
 USE_TESSERACT_CLI = os.getenv("USE_TESSERACT_CLI", "false").lower() == "true"
 FARMER_DB_PATH = os.getenv("FARMER_DB_PATH", "data/farmers.db")
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "")
+# Image uploads larger than this are rejected with 413.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_MB", "20")) * 1024 * 1024
+MAX_VERIFY_JOBS = int(os.getenv("MAX_VERIFY_JOBS", "1024"))
 
 # Initialize FastAPI
 app = FastAPI(
     title="Farmers for Forests - Document Verification",
     description="AI-powered document verification for farmer onboarding. Supports Hindi, Marathi, and English.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS for frontend
@@ -57,38 +68,115 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components (lazy loading)
-_ocr = None
-_validator = None
+# Compress larger JSON responses (OCR text, farmer lists) for slow mobile links
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
+# Initialize components (lazy loading)
+@functools.lru_cache(maxsize=1)
 def get_ocr():
-    global _ocr
-    if _ocr is None:
-        _ocr = OCRPipeline(
-            use_google_vision=USE_GOOGLE_VISION,
-            allow_tesseract=USE_TESSERACT,
-            allow_tesseract_cli=USE_TESSERACT_CLI,
-        )
-    return _ocr
+    return OCRPipeline(
+        use_google_vision=USE_GOOGLE_VISION,
+        allow_tesseract=USE_TESSERACT,
+        allow_tesseract_cli=USE_TESSERACT_CLI,
+    )
+
 
 def get_validator():
-    global _validator
-    if _validator is None:
-        db_path = Path(__file__).parent.parent / FARMER_DB_PATH
-        if db_path.exists():
-            _validator = ValidationEngine(str(db_path))
-        else:
-            # Use sample data if no database
-            _validator = ValidationEngine([
-                {
-                    "id": "DEMO001",
-                    "name": "राजेश कुमार पाटिल",
-                    "name_en": "Rajesh Kumar Patil",
-                    "account_number": "12345678901234",
-                    "ifsc_code": "SBIN0001234"
-                }
-            ])
-    return _validator
+    db_path = Path(__file__).parent.parent / FARMER_DB_PATH
+    try:
+        key = (db_path.stat().st_ino, farmers_version(str(db_path)))
+    except FileNotFoundError:
+        key = None
+    return _load_validator(str(db_path), key)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_validator(db_path: str, key: Optional[tuple]) -> ValidationEngine:
+    # Keyed on the DB file's inode (a replaced database) and the farmers
+    # table version, not the mtime, which every WAL checkpoint bumps, even
+    # for document writes that leave farmers untouched.
+    if key is not None:
+        return ValidationEngine(db_path)
+    # Use sample data if no database
+    return ValidationEngine([
+        {
+            "id": "DEMO001",
+            "name": "राजेश कुमार पाटिल",
+            "name_en": "Rajesh Kumar Patil",
+            "account_number": "12345678901234",
+            "ifsc_code": "SBIN0001234"
+        }
+    ])
+
+
+# Bounds concurrent OCR/quality/validation work so a burst of uploads cannot
+# pile up more CPU-bound threads than there are cores. Created lazily because
+# anyio limiters need a running event loop.
+_pipeline_limiter: Optional[anyio.CapacityLimiter] = None
+# Google Vision waits are network-bound and get their own threads, so they
+# neither hold CPU slots nor starve anyio's default pool (sync routes).
+VISION_CONCURRENCY = int(os.getenv("VISION_CONCURRENCY", "32"))
+_vision_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run blocking pipeline work in a worker thread under the pipeline limiter."""
+    global _pipeline_limiter
+    if _pipeline_limiter is None:
+        _pipeline_limiter = anyio.CapacityLimiter(os.cpu_count() or 1)
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=_pipeline_limiter
+    )
+
+
+async def _run_ocr(
+    ocr: OCRPipeline,
+    content: bytes,
+    digest: Optional[bytes] = None,
+    image=None,
+) -> OCRResult:
+    """Run OCR in a worker thread.
+
+    For Google Vision the downscale runs under the pipeline limiter and the
+    network wait (and request batcher) under _vision_limiter, so Vision calls
+    can overlap beyond the CPU-sized pool. Local Tesseract stays CPU-bound.
+    """
+    if ocr.use_google_vision:
+        global _vision_limiter
+        if _vision_limiter is None:
+            _vision_limiter = anyio.CapacityLimiter(VISION_CONCURRENCY)
+        if digest is None:
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+        vision_content = await _run_blocking(ocr.prepare_for_vision, content, digest)
+        return await anyio.to_thread.run_sync(
+            functools.partial(
+                ocr.extract_text_bytes,
+                content,
+                digest=digest,
+                image=image,
+                vision_content=vision_content,
+            ),
+            limiter=_vision_limiter,
+        )
+    return await _run_blocking(ocr.extract_text_bytes, content, digest=digest, image=image)
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Copy an upload into memory in 1 MiB chunks, raising 413 once the copy
+    exceeds MAX_UPLOAD_BYTES.
+
+    Starlette has already spooled the whole request body (to memory or a
+    temp file) before this runs; the limit bounds the in-memory copy and the
+    pipeline work, not what the server receives.
+    """
+    chunks = []
+    size = 0
+    while chunk := await file.read(1024 * 1024):
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(413, f"File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 def require_admin(x_admin_key: str = Header(default="")):
@@ -100,41 +188,14 @@ def require_admin(x_admin_key: str = Header(default="")):
 def on_startup():
     db_path = Path(__file__).parent.parent / FARMER_DB_PATH
     init_db(str(db_path))
-
-
-# Response Models
-class QualityResponse(BaseModel):
-    is_acceptable: bool
-    blur_score: float
-    brightness_score: float
-    glare_score: float
-    angle_score: float
-    resolution_ok: bool
-    issues: List[str]
-    suggestions: List[str]
-
-class OCRResponse(BaseModel):
-    raw_text: str
-    detected_language: str
-    confidence: float
-    fields: dict
-    ocr_engine: str
-
-class ValidationResponse(BaseModel):
-    is_valid: bool
-    confidence: float
-    matched_farmer: Optional[dict]
-    field_matches: dict
-    issues: List[str]
-    warnings: List[str]
-
-class VerificationResponse(BaseModel):
-    success: bool
-    quality: QualityResponse
-    ocr_result: Optional[OCRResponse]
-    validation: Optional[ValidationResponse]
-    summary: str
-    next_steps: List[str]
+    # Build the pipeline components now so the first /verify request does
+    # not pay for client setup, model loading and the farmer table load.
+    get_validator()
+    try:
+        get_ocr().warm_up()
+    except Exception:
+        # OCR disabled or unavailable; /verify reports this per request.
+        pass
 
 
 class FarmerBase(BaseModel):
@@ -186,7 +247,9 @@ class GoogleCredentialsPayload(BaseModel):
 
 @app.get("/farmers", dependencies=[Depends(require_admin)])
 def api_list_farmers():
-    return list_farmers()
+    # Rows are plain JSON types, so hand them straight to orjson instead of
+    # walking every value through FastAPI's jsonable_encoder first.
+    return ORJSONResponse(list_farmers())
 
 
 @app.get("/farmers/{farmer_id}", dependencies=[Depends(require_admin)])
@@ -194,21 +257,21 @@ def api_get_farmer(farmer_id: str):
     farmer = get_farmer(farmer_id)
     if not farmer:
         raise HTTPException(404, "Farmer not found")
-    return farmer
+    return ORJSONResponse(farmer)
 
 
 @app.post("/farmers", dependencies=[Depends(require_admin)])
 def api_create_farmer(payload: FarmerCreate):
-    created = create_farmer(payload.dict())
-    return created
+    created = create_farmer(payload.model_dump())
+    return ORJSONResponse(created)
 
 
 @app.put("/farmers/{farmer_id}", dependencies=[Depends(require_admin)])
 def api_update_farmer(farmer_id: str, payload: FarmerUpdate):
-    updated = update_farmer(farmer_id, payload.dict(exclude_none=True))
+    updated = update_farmer(farmer_id, payload.model_dump(exclude_none=True))
     if not updated:
         raise HTTPException(404, "Farmer not found")
-    return updated
+    return ORJSONResponse(updated)
 
 
 @app.delete("/farmers/{farmer_id}", dependencies=[Depends(require_admin)])
@@ -223,12 +286,12 @@ def api_get_profile(farmer_id: str):
     profile = get_profile(farmer_id)
     if not profile:
         raise HTTPException(404, "Profile not found")
-    return profile
+    return ORJSONResponse(profile)
 
 
 @app.post("/profiles", dependencies=[Depends(require_admin)])
 def api_upsert_profile(payload: ProfileUpsert):
-    return upsert_profile(payload.dict())
+    return ORJSONResponse(upsert_profile(payload.model_dump()))
 
 
 @app.delete("/profiles/{farmer_id}", dependencies=[Depends(require_admin)])
@@ -240,7 +303,7 @@ def api_delete_profile(farmer_id: str):
 
 @app.get("/documents", dependencies=[Depends(require_admin)])
 def api_list_documents(farmer_id: Optional[str] = None):
-    return list_documents(farmer_id)
+    return ORJSONResponse(list_documents(farmer_id))
 
 
 @app.get("/documents/{doc_id}", dependencies=[Depends(require_admin)])
@@ -248,20 +311,20 @@ def api_get_document(doc_id: int):
     document = get_document(doc_id)
     if not document:
         raise HTTPException(404, "Document not found")
-    return document
+    return ORJSONResponse(document)
 
 
 @app.post("/documents", dependencies=[Depends(require_admin)])
 def api_create_document(payload: DocumentCreate):
-    return create_document(payload.dict())
+    return ORJSONResponse(create_document(payload.model_dump()))
 
 
 @app.put("/documents/{doc_id}", dependencies=[Depends(require_admin)])
 def api_update_document(doc_id: int, payload: DocumentUpdate):
-    updated = update_document(doc_id, payload.dict(exclude_none=True))
+    updated = update_document(doc_id, payload.model_dump(exclude_none=True))
     if not updated:
         raise HTTPException(404, "Document not found")
-    return updated
+    return ORJSONResponse(updated)
 
 
 @app.delete("/documents/{doc_id}", dependencies=[Depends(require_admin)])
@@ -277,9 +340,14 @@ def api_set_google_credentials(payload: GoogleCredentialsPayload):
     credentials_path.write_text(payload.json, encoding="utf-8")
 
     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = str(credentials_path)
-    global USE_GOOGLE_VISION, _ocr
+    global USE_GOOGLE_VISION
     USE_GOOGLE_VISION = True
-    _ocr = None
+    # Retire the old pipeline's batcher thread; the rebuilt pipeline picks a
+    # client for the new credentials file contents.
+    old_ocr = get_ocr() if get_ocr.cache_info().currsize else None
+    get_ocr.cache_clear()
+    if old_ocr is not None:
+        old_ocr.close()
     return {"configured": True, "path": str(credentials_path)}
 
 
@@ -300,7 +368,20 @@ async def root():
     }
 
 
-@app.post("/verify", response_model=VerificationResponse)
+def _check_image_upload(file: UploadFile) -> None:
+    # Validate file type (allow missing/incorrect content-type if extension is image)
+    content_type = file.content_type or ""
+    guessed_type, _ = mimetypes.guess_type(file.filename or "")
+    is_image = content_type.startswith("image/")
+    if not is_image and guessed_type:
+        is_image = guessed_type.startswith("image/")
+    if not is_image and content_type in {"application/octet-stream", "binary/octet-stream"}:
+        is_image = (guessed_type or "").startswith("image/")
+    if not is_image:
+        raise HTTPException(400, "File must be an image (jpg, png)")
+
+
+@app.post("/verify")
 async def verify_document(file: UploadFile = File(...)):
     """
     Full document verification pipeline.
@@ -312,157 +393,203 @@ async def verify_document(file: UploadFile = File(...)):
     
     Returns comprehensive verification result.
     """
-    # Validate file type (allow missing/incorrect content-type if extension is image)
-    content_type = file.content_type or ""
-    guessed_type, _ = mimetypes.guess_type(file.filename or "")
-    is_image = content_type.startswith("image/")
-    if not is_image and guessed_type:
-        is_image = guessed_type.startswith("image/")
-    if not is_image and content_type in {"application/octet-stream", "binary/octet-stream"}:
-        is_image = (guessed_type or "").startswith("image/")
-    if not is_image:
-        raise HTTPException(400, "File must be an image (jpg, png)")
+    _check_image_upload(file)
+    content = await _read_upload(file)
+    # Returned directly so orjson also handles numpy scalars from OpenCV.
+    return ORJSONResponse(await _run_verification(content))
+
+
+# Recent /verify/jobs results in submission order, oldest evicted first.
+# In-process only; multi-worker deployments need a shared store instead.
+_verify_jobs: "OrderedDict[str, dict]" = OrderedDict()
+
+
+@app.post("/verify/jobs", status_code=202)
+async def submit_verify_job(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """
+    Queue the verification pipeline and return a job id immediately.
     
-    # Save to temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
+    Poll GET /verify/jobs/{job_id} for the result, which has the same
+    shape as the /verify response.
+    """
+    _check_image_upload(file)
+    content = await _read_upload(file)
+    job_id = uuid.uuid4().hex
+    _verify_jobs[job_id] = {"job_id": job_id, "status": "pending"}
+    while len(_verify_jobs) > MAX_VERIFY_JOBS:
+        _verify_jobs.popitem(last=False)
+    background_tasks.add_task(_run_verify_job, job_id, content)
+    return {"job_id": job_id, "status": "pending"}
+
+
+@app.get("/verify/jobs/{job_id}")
+def get_verify_job(job_id: str):
+    job = _verify_jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return ORJSONResponse(job)
+
+
+async def _run_verify_job(job_id: str, content: bytes) -> None:
+    try:
+        job = {"job_id": job_id, "status": "done", "result": await _run_verification(content)}
+    except Exception as e:
+        job = {"job_id": job_id, "status": "failed", "error": str(e)}
+    if job_id in _verify_jobs:
+        _verify_jobs[job_id] = job
+
+
+async def _run_verification(content: bytes) -> dict:
+    """Run quality assessment, OCR and validation on an uploaded image."""
+    digest = hashlib.blake2b(content, digest_size=16).digest()
+
+    try:
+        ocr = get_ocr()
+        ocr_error = None
+    except Exception as e:
+        ocr, ocr_error = None, e
+
+    # Step 1: Quality Assessment, decoding the image for OCR alongside it
+    if ocr is not None:
+        quality, decoded = await asyncio.gather(
+            _run_blocking(assess_quality_bytes, content, digest=digest),
+            _run_blocking(ocr.decode_image, content),
+        )
+    else:
+        quality = await _run_blocking(assess_quality_bytes, content, digest=digest)
+        decoded = None
+    
+    if not quality.is_acceptable:
+        return _verification_payload(
+            success=False,
+            quality=quality,
+            ocr_result=None,
+            validation=None,
+            summary="📷 Document quality insufficient for processing.",
+            next_steps=quality.suggestions or ["Please retake the photo with better lighting and focus"]
+        )
     
+    # Step 2: OCR Extraction
     try:
-        # Step 1: Quality Assessment
-        quality = assess_quality(tmp_path)
-        quality_response = QualityResponse(**quality.__dict__)
-        
-        if not quality.is_acceptable:
-            return VerificationResponse(
-                success=False,
-                quality=quality_response,
-                ocr_result=None,
-                validation=None,
-                summary="📷 Document quality insufficient for processing.",
-                next_steps=quality.suggestions or ["Please retake the photo with better lighting and focus"]
-            )
-        
-        # Step 2: OCR Extraction
-        try:
-            ocr = get_ocr()
-            ocr_result = ocr.extract_text(tmp_path)
-        except Exception as e:
-            return VerificationResponse(
-                success=False,
-                quality=quality_response,
-                ocr_result=None,
-                validation=None,
-                summary=f"❌ OCR processing failed: {str(e)}",
-                next_steps=["Please try again or contact support"]
-            )
-        
-        ocr_response = OCRResponse(
-            raw_text=ocr_result.raw_text[:1000],  # Truncate for response
-            detected_language=ocr_result.detected_language,
-            confidence=ocr_result.confidence,
-            fields=ocr_result.extracted_fields,
-            ocr_engine=ocr_result.ocr_engine
+        if ocr_error is not None:
+            raise ocr_error
+        ocr_result = await _run_ocr(ocr, content, digest, image=decoded)
+    except Exception as e:
+        return _verification_payload(
+            success=False,
+            quality=quality,
+            ocr_result=None,
+            validation=None,
+            summary=f"❌ OCR processing failed: {str(e)}",
+            next_steps=["Please try again or contact support"]
         )
-        
-        # Check if any fields were extracted
-        fields = ocr_result.extracted_fields
-        if not any(fields.values()):
-            return VerificationResponse(
-                success=False,
-                quality=quality_response,
-                ocr_result=ocr_response,
-                validation=None,
-                summary="⚠️ Could not extract any fields from document.",
-                next_steps=[
-                    "Ensure document contains visible name, account number, or land details",
-                    "Try uploading a clearer image"
-                ]
-            )
-        
-        # Step 3: Validation
-        validator = get_validator()
-        validation = validator.validate(fields)
-        
-        validation_response = ValidationResponse(
-            is_valid=validation.is_valid,
-            confidence=validation.confidence,
-            matched_farmer=_sanitize_farmer(validation.matched_farmer),
-            field_matches=validation.field_matches,
-            issues=validation.issues,
-            warnings=validation.warnings
+    
+    # Check if any fields were extracted
+    fields = ocr_result.extracted_fields
+    if not any(fields.values()):
+        return _verification_payload(
+            success=False,
+            quality=quality,
+            ocr_result=ocr_result,
+            validation=None,
+            summary="⚠️ Could not extract any fields from document.",
+            next_steps=[
+                "Ensure document contains visible name, account number, or land details",
+                "Try uploading a clearer image"
+            ]
         )
-        
-        # Build summary and next steps
-        if validation.is_valid:
-            farmer_name = validation.matched_farmer.get('name_en') or validation.matched_farmer.get('name', 'Unknown')
-            summary = f"✅ Document verified! Matched farmer: {farmer_name}"
+    
+    # Step 3: Validation
+    validator = await _run_blocking(get_validator)
+    validation = await _run_blocking(validator.validate, fields)
+    
+    # Build summary and next steps
+    if validation.is_valid:
+        farmer_name = validation.matched_farmer.get('name_en') or validation.matched_farmer.get('name', 'Unknown')
+        summary = f"✅ Document verified! Matched farmer: {farmer_name}"
+    else:
+        reasons = validation.issues or validation.warnings
+        if reasons:
+            reason_text = "; ".join(reasons[:3])
+            summary = (
+                "⚠️ Document needs review. "
+                f"Reason(s): {reason_text}."
+            )
         else:
-            reasons = validation.issues or validation.warnings
-            if reasons:
-                reason_text = "; ".join(reasons[:3])
-                summary = (
-                    "⚠️ Document needs review. "
-                    f"Reason(s): {reason_text}."
-                )
-            else:
-                summary = "⚠️ Document needs review. No specific issues detected."
-
-        next_steps = _build_next_steps(quality_response, ocr_response, validation)
-        
-        return VerificationResponse(
-            success=validation.is_valid,
-            quality=quality_response,
-            ocr_result=ocr_response,
-            validation=validation_response,
-            summary=summary,
-            next_steps=next_steps
-        )
+            summary = "⚠️ Document needs review. No specific issues detected."
+
+    next_steps = _build_next_steps(quality, ocr_result, validation)
     
-    finally:
-        # Cleanup
-        try:
-            os.unlink(tmp_path)
-        except:
-            pass
+    return _verification_payload(
+        success=validation.is_valid,
+        quality=quality,
+        ocr_result=ocr_result,
+        validation=validation,
+        summary=summary,
+        next_steps=next_steps
+    )
+
+
+def _verification_payload(
+    success: bool,
+    quality: QualityReport,
+    ocr_result: Optional[OCRResult],
+    validation: Optional[ValidationResult],
+    summary: str,
+    next_steps: List[str],
+) -> dict:
+    """Build the /verify payload directly from the pipeline dataclasses."""
+    ocr_payload = None
+    if ocr_result:
+        ocr_payload = {
+            "raw_text": ocr_result.raw_text[:1000],  # Truncate for response
+            "detected_language": ocr_result.detected_language,
+            "confidence": ocr_result.confidence,
+            "fields": ocr_result.extracted_fields,
+            "ocr_engine": ocr_result.ocr_engine,
+        }
+    validation_payload = None
+    if validation:
+        validation_payload = {
+            "is_valid": validation.is_valid,
+            "confidence": validation.confidence,
+            "matched_farmer": _sanitize_farmer(validation.matched_farmer),
+            "field_matches": validation.field_matches,
+            "issues": validation.issues,
+            "warnings": validation.warnings,
+        }
+    return {
+        "success": success,
+        "quality": quality.__dict__,
+        "ocr_result": ocr_payload,
+        "validation": validation_payload,
+        "summary": summary,
+        "next_steps": next_steps,
+    }
 
 
 @app.post("/quality")
 async def check_quality(file: UploadFile = File(...)):
     """Check document quality only (no OCR)."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
-    try:
-        quality = assess_quality(tmp_path)
-        return quality.__dict__
-    finally:
-        os.unlink(tmp_path)
+    content = await _read_upload(file)
+    quality = await _run_blocking(assess_quality_bytes, content)
+    return ORJSONResponse(quality.__dict__)
 
 
 @app.post("/ocr")
 async def extract_text(file: UploadFile = File(...)):
     """Run OCR only (no validation)."""
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
-    try:
-        ocr = get_ocr()
-        result = ocr.extract_text(tmp_path)
-        return {
-            "raw_text": result.raw_text,
-            "language": result.detected_language,
-            "confidence": result.confidence,
-            "fields": result.extracted_fields,
-            "engine": result.ocr_engine
-        }
-    finally:
-        os.unlink(tmp_path)
+    content = await _read_upload(file)
+    ocr = get_ocr()
+    result = await _run_ocr(ocr, content)
+    # orjson writes Devanagari text as raw UTF-8 rather than \uXXXX escapes.
+    return ORJSONResponse({
+        "raw_text": result.raw_text,
+        "language": result.detected_language,
+        "confidence": result.confidence,
+        "fields": result.extracted_fields,
+        "engine": result.ocr_engine
+    })
 
 
 class ValidateRequest(BaseModel):
@@ -476,13 +603,13 @@ class ValidateRequest(BaseModel):
 @app.post("/validate")
 async def validate_fields(request: ValidateRequest):
     """Validate extracted fields against database (JSON input)."""
-    validator = get_validator()
-    fields = request.dict(exclude_none=True)
+    validator = await _run_blocking(get_validator)
+    fields = request.model_dump(exclude_none=True)
     
     if not fields:
         raise HTTPException(400, "At least one field must be provided")
     
-    result = validator.validate(fields)
+    result = await _run_blocking(validator.validate, fields)
     return {
         "is_valid": result.is_valid,
         "confidence": result.confidence,
@@ -493,19 +620,23 @@ async def validate_fields(request: ValidateRequest):
     }
 
 
+_SAFE_FARMER_FIELDS = frozenset(('id', 'name', 'name_en', 'village', 'district', 'state'))
+# Fields a usable document should show, in the order they are reported.
+_EXPECTED_DOC_FIELDS = ('name', 'account_number', 'ifsc_code', 'survey_number')
+
+
 def _sanitize_farmer(farmer: Optional[dict]) -> Optional[dict]:
     """Remove sensitive fields from farmer record for response."""
     if not farmer:
         return None
     
     # Return only safe fields
-    safe_fields = ['id', 'name', 'name_en', 'village', 'district', 'state']
-    return {k: v for k, v in farmer.items() if k in safe_fields}
+    return {k: farmer[k] for k in _SAFE_FARMER_FIELDS & farmer.keys()}
 
 
 def _build_next_steps(
-    quality: QualityResponse,
-    ocr_result: Optional[OCRResponse],
+    quality: QualityReport,
+    ocr_result: Optional[OCRResult],
     validation: ValidationResult
 ) -> List[str]:
     steps: List[str] = []
@@ -521,9 +652,10 @@ def _build_next_steps(
         steps.append("If OCR keeps failing, capture a higher-resolution image")
         return steps
 
+    fields = ocr_result.extracted_fields
     missing_fields = [
-        field for field, value in ocr_result.fields.items()
-        if field in {"name", "account_number", "ifsc_code", "survey_number"} and not value
+        field for field in _EXPECTED_DOC_FIELDS
+        if field in fields and not fields[field]
     ]
     if missing_fields:
         steps.append(f"Ensure these fields are clearly visible: {', '.join(missing_fields)}")
@@ -3,13 +3,152 @@ OCR Pipeline Module
 Extracts text from documents in Hindi, Marathi, and English.
 """
 
+import functools
+import hashlib
+import io
+import os
+import queue
 import re
 import subprocess
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import BinaryIO, Optional, Dict, Union
 from pathlib import Path
 
 
+_DEVANAGARI_RE = re.compile('[\u0900-\u097F]')
+_DIGIT_RE = re.compile(r'\d')
+
+# Field extraction patterns, compiled once at import.
+_ACCOUNT_RES = [
+    re.compile(r'(?:a/?c|account|खाता)\s*(?:no\.?|number|नं\.?)?\s*:?\s*(\d{10,18})', re.I),
+    re.compile(r'\b([1-9]\d{9,17})\b', re.I),
+]
+_IFSC_RE = re.compile(r'\b([A-Z]{4}0[A-Z0-9]{6})\b')
+_AADHAAR_RES = [
+    re.compile(r'(?:aadhaar|आधार)\s*:?\s*(\d{4}\s?\d{4}\s?\d{4})', re.I),
+    re.compile(r'\b(\d{4}\s?\d{4}\s?\d{4})\b', re.I),
+]
+_SURVEY_RES = [
+    re.compile(r'(?:survey|khasra|खसरा|सर्वे|गट)\s*(?:no\.?|number|नं\.?|क्र\.?)?\s*:?\s*([0-9]+[\/\-]?[A-Za-z0-9]*)', re.I),
+    re.compile(r'(?:plot|प्लॉट)\s*(?:no\.?)?\s*:?\s*([0-9]+[\/\-]?[A-Za-z0-9]*)', re.I),
+]
+_AREA_RES = [
+    re.compile(r'(\d+\.?\d*)\s*(acres?|hectares?|एकड़|हेक्टेयर|गुंठे|आर)', re.I),
+    re.compile(r'(?:area|क्षेत्र)\s*:?\s*(\d+\.?\d*)\s*(acres?|hectares?|एकड़|हेक्टेयर)?', re.I),
+]
+_PHONE_RE = re.compile(r'(?:\+91|91)?[- ]?([6-9]\d{9})\b')
+_NAME_RES = [
+    re.compile(r'(?:name|नाम|नांव)\s*:?\s*([^\n,\d]{3,50})', re.I | re.M),
+    re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})', re.I | re.M),  # English name at start
+]
+
+
+# gRPC channel options for the Vision client: keep the connection alive
+# between bursts of uploads instead of re-handshaking after idle periods.
+_VISION_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+# Vision reads text fine at ~2 MP; larger uploads are downscaled to this
+# longest edge before sending to cut payload size and RPC time.
+_VISION_MAX_EDGE = 2048
+_VISION_JPEG_QUALITY = 85
+
+_vision_clients: Dict[tuple, object] = {}
+_vision_clients_lock = threading.Lock()
+
+
+def _credentials_key() -> tuple:
+    """GOOGLE_APPLICATION_CREDENTIALS and a digest of the file it names, so
+    credentials rewritten in place at the same path still count as new."""
+    path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    digest = None
+    if path:
+        try:
+            with open(path, 'rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).digest()
+        except OSError:
+            pass
+    return path, digest
+
+
+def _shared_vision_client(vision):
+    """
+    Return the process-wide ImageAnnotatorClient for the current credentials.
+
+    Clients are keyed by _credentials_key() so that uploading new
+    credentials (which rebuilds the pipeline) also gets a fresh client.
+    """
+    key = _credentials_key()
+    with _vision_clients_lock:
+        client = _vision_clients.get(key)
+        if client is None:
+            from google.cloud.vision_v1.services.image_annotator.transports import (
+                ImageAnnotatorGrpcTransport,
+            )
+            channel = ImageAnnotatorGrpcTransport.create_channel(
+                options=_VISION_CHANNEL_OPTIONS
+            )
+            client = vision.ImageAnnotatorClient(
+                transport=ImageAnnotatorGrpcTransport(channel=channel)
+            )
+            _vision_clients.clear()
+            _vision_clients[key] = client
+        return client
+
+
+def _shrink_for_vision(content: bytes) -> bytes:
+    """Downscale an encoded image to _VISION_MAX_EDGE, re-encoding as JPEG."""
+    try:
+        from PIL import Image, ImageOps
+        img = Image.open(io.BytesIO(content))
+        if max(img.size) <= _VISION_MAX_EDGE:
+            return content
+        # Let the JPEG decoder skip straight to a reduced scale where it can.
+        img.draft("RGB", (_VISION_MAX_EDGE, _VISION_MAX_EDGE))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((_VISION_MAX_EDGE, _VISION_MAX_EDGE), Image.LANCZOS)
+        buf = io.BytesIO()
+        img.convert("RGB").save(buf, format="JPEG", quality=_VISION_JPEG_QUALITY)
+    except Exception:
+        # Unreadable here (or no PIL); let Vision decide what to do with it.
+        return content
+    return buf.getvalue()
+
+
+# Pure function of the text; retried uploads repeat the same OCR text.
+@functools.lru_cache(maxsize=1024)
+def _detect_language(text: str) -> str:
+    """Detect primary language from text."""
+    # Check for Devanagari script (Hindi/Marathi); both counts run in C.
+    devanagari_chars = len(_DEVANAGARI_RE.findall(text))
+    if not devanagari_chars:
+        return "en" if any(map(str.isalpha, text)) else "unknown"
+    total_alpha = sum(map(str.isalpha, text))
+    
+    if total_alpha == 0:
+        return "unknown"
+    
+    devanagari_ratio = devanagari_chars / total_alpha
+    
+    if devanagari_ratio > 0.3:
+        # Could be Hindi or Marathi - check for Marathi-specific words
+        marathi_markers = ['आहे', 'नाही', 'होते', 'असे', 'करणे']
+        if any(marker in text for marker in marathi_markers):
+            return "mr"  # Marathi
+        return "hi"  # Hindi
+    
+    return "en"  # English
+
+
 @dataclass
 class OCRResult:
     raw_text: str
@@ -19,6 +158,146 @@ class OCRResult:
     ocr_engine: str
 
 
+class _VisionBatcher:
+    """
+    Coalesces concurrent Google Vision calls into batch_annotate_images RPCs.
+    
+    Callers block on submit(); a background thread gathers up to max_batch
+    images (at most max_batch_bytes in total, waiting at most max_wait
+    seconds after the first) and sends them as one request, amortizing the
+    per-RPC round trip. If a batch RPC fails, its images are retried one per
+    request so a single bad image cannot fail the others.
+    """
+    
+    def __init__(
+        self,
+        client,
+        vision,
+        max_batch: int = 16,
+        max_wait: float = 0.02,
+        max_batch_bytes: int = 8 * 1024 * 1024,
+        timeout: float = 60.0,
+    ):
+        self._client = client
+        self._vision = vision
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._max_batch_bytes = max_batch_bytes
+        self._timeout = timeout
+        self._queue: "queue.Queue[tuple[bytes, Future]]" = queue.Queue()
+        self._carry = None  # item that did not fit in the previous batch
+        self._closing = False  # close() sentinel reached
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def submit(self, content: bytes):
+        """Annotate one image; returns its AnnotateImageResponse."""
+        future: Future = Future()
+        # Queued under the lock so a closing thread cannot miss the item.
+        with self._lock:
+            self._queue.put((content, future))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="vision-batcher", daemon=True
+                )
+                self._thread.start()
+        try:
+            return future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise RuntimeError("Google Vision request timed out") from None
+    
+    def close(self) -> None:
+        """Stop the batcher thread once the images already queued are sent."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+    
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self._annotate(batch)
+                except Exception as exc:
+                    _fail_pending(batch, exc)
+            if self._closing:
+                with self._lock:
+                    self._closing = False
+                    if self._queue.empty() and self._carry is None:
+                        self._thread = None
+                        return
+    
+    def _next_batch(self) -> list:
+        first, self._carry = self._carry or self._queue.get(), None
+        if first is None:
+            self._closing = True
+            return []
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self._max_wait
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._closing = True
+                break
+            if size + len(item[0]) > self._max_batch_bytes:
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+    
+    def _annotate(self, batch: list) -> None:
+        # Callers that timed out have cancelled their futures; skip them.
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        vision = self._vision
+        requests = [
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=content),
+                features=[vision.Feature(type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION)],
+                image_context=vision.ImageContext(language_hints=["hi", "mr", "en"]),
+            )
+            for content, _ in batch
+        ]
+        try:
+            response = self._client.batch_annotate_images(requests=requests)
+        except Exception as exc:
+            if len(batch) == 1:
+                batch[0][1].set_exception(exc)
+                return
+            for item, request in zip(batch, requests):
+                try:
+                    response = self._client.batch_annotate_images(requests=[request])
+                except Exception as item_exc:
+                    item[1].set_exception(item_exc)
+                else:
+                    self._resolve([item], response)
+            return
+        self._resolve(batch, response)
+    
+    @staticmethod
+    def _resolve(batch: list, response) -> None:
+        for (_, future), image_response in zip(batch, response.responses):
+            future.set_result(image_response)
+        _fail_pending(batch, RuntimeError("Google Vision returned no response for the image"))
+
+
+def _fail_pending(batch: list, exc: Exception) -> None:
+    """Fail every future in batch that has not been resolved yet."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(exc)
+
+
 class OCRPipeline:
     """
     Multi-language OCR pipeline supporting Hindi, Marathi, and English.
@@ -30,12 +309,23 @@ class OCRPipeline:
         use_google_vision: bool = True,
         allow_tesseract: bool = False,
         allow_tesseract_cli: bool = False,
+        cache_size: int = 512,
     ):
         self.use_google_vision = use_google_vision
         self.allow_tesseract = allow_tesseract
         self.allow_tesseract_cli = allow_tesseract_cli
+        # Results for recently seen images, keyed by content digest, so a
+        # retried or duplicate upload skips the OCR engine entirely.
+        self._cache_size = cache_size
+        self._cache: "OrderedDict[bytes, OCRResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.client = None
         self._vision = None
+        self._vision_batcher = None
+        # In-process libtesseract handles (tesserocr), reused across calls
+        # so language data is loaded once per handle rather than per call.
+        self._tesserocr = None
+        self._tess_apis: "queue.LifoQueue" = queue.LifoQueue()
 
         if self.use_google_vision:
             try:
@@ -43,42 +333,149 @@ class OCRPipeline:
             except Exception as exc:
                 raise RuntimeError("Google Vision is not available.") from exc
             self._vision = vision
-            self.client = vision.ImageAnnotatorClient()
+            self.client = _shared_vision_client(vision)
+            self._vision_batcher = _VisionBatcher(self.client, vision)
         elif not self.allow_tesseract and not self.allow_tesseract_cli:
             raise RuntimeError(
                 "OCR is disabled. Set USE_TESSERACT_CLI=true or USE_TESSERACT=true."
             )
+        elif self.allow_tesseract and not self.allow_tesseract_cli:
+            try:
+                import tesserocr
+            except Exception:
+                tesserocr = None  # fall back to pytesseract
+            self._tesserocr = tesserocr
     
-    def extract_text(self, image_path: str) -> OCRResult:
+    def extract_text(self, image_path: Union[str, bytes, BinaryIO]) -> OCRResult:
         """
         Extract text from document image.
         
         Args:
-            image_path: Path to image file
+            image_path: Path to image file, encoded image bytes, or a binary
+                file object (e.g. an upload's spooled file)
             
         Returns:
             OCRResult with extracted text and fields
         """
+        if isinstance(image_path, (bytes, bytearray)):
+            content = bytes(image_path)
+        elif hasattr(image_path, "read"):
+            content = image_path.read()
+        else:
+            with open(image_path, 'rb') as f:
+                content = f.read()
+        return self.extract_text_bytes(content)
+
+    def close(self) -> None:
+        """Stop background helpers (the Vision request batcher thread)."""
+        if self._vision_batcher is not None:
+            self._vision_batcher.close()
+
+    def warm_up(self) -> None:
+        """
+        Load engine state ahead of the first request.
+
+        For in-process Tesseract this runs one tiny recognition so the
+        Hindi+English language data is loaded; other engines are ready once
+        constructed. Failures are left for the first real request to report.
+        """
+        if self.use_google_vision or self.allow_tesseract_cli or not self.allow_tesseract:
+            return
+        try:
+            if self._tesserocr is not None:
+                self._release_tess_api(self._acquire_tess_api())
+                return
+            import pytesseract
+            from PIL import Image
+            pytesseract.image_to_string(Image.new("RGB", (10, 10), "white"), lang='hin+eng')
+        except Exception:
+            pass
+
+    def decode_image(self, content: bytes):
+        """
+        Decode an upload for the in-process Tesseract engine ahead of OCR.
+
+        Returns None when the active engine works from the encoded bytes
+        (Google Vision, tesseract CLI) or the image cannot be decoded here;
+        extract_text_bytes then decodes (and reports errors) itself.
+        """
+        if self.use_google_vision or self.allow_tesseract_cli or not self.allow_tesseract:
+            return None
+        try:
+            from PIL import Image
+            img = Image.open(io.BytesIO(content))
+            img.load()
+        except Exception:
+            return None
+        return img
+
+    def extract_text_bytes(
+        self,
+        content: bytes,
+        digest: Optional[bytes] = None,
+        image=None,
+        vision_content: Optional[bytes] = None,
+    ) -> OCRResult:
+        """
+        Extract text from an encoded document image held in memory.
+        
+        Args:
+            content: Encoded image bytes (JPG/PNG)
+            digest: BLAKE2b digest of content, if the caller already has one
+            image: Result of decode_image(content), if already decoded
+            vision_content: Result of prepare_for_vision(content), if already
+                shrunk for Google Vision
+            
+        Returns:
+            OCRResult with extracted text and fields
+        """
+        if digest is None:
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+        with self._cache_lock:
+            result = self._cache.get(digest)
+            if result is not None:
+                self._cache.move_to_end(digest)
+                return result
+
+        result = self._run_engine(content, image, vision_content)
+        with self._cache_lock:
+            self._cache[digest] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def prepare_for_vision(self, content: bytes, digest: bytes) -> Optional[bytes]:
+        """
+        Downscale content for Google Vision ahead of extract_text_bytes, so
+        the CPU-bound resize can run apart from the network wait.
+        
+        Returns None when the result for digest is already cached.
+        """
+        with self._cache_lock:
+            if digest in self._cache:
+                return None
+        return _shrink_for_vision(content)
+
+    def _run_engine(
+        self, content: bytes, image=None, vision_content: Optional[bytes] = None
+    ) -> OCRResult:
         if self.use_google_vision:
-            return self._google_vision_ocr(image_path)
+            return self._google_vision_ocr(content, vision_content)
         if self.allow_tesseract_cli:
-            return self._tesseract_cli_ocr(image_path)
+            return self._tesseract_cli_ocr(content)
         if self.allow_tesseract:
-            return self._tesseract_ocr(image_path)
+            return self._tesseract_ocr(content, image)
         raise RuntimeError("No OCR engine enabled.")
     
-    def _google_vision_ocr(self, image_path: str) -> OCRResult:
+    def _google_vision_ocr(
+        self, content: bytes, vision_content: Optional[bytes] = None
+    ) -> OCRResult:
         """Use Google Cloud Vision API for OCR."""
-        with open(image_path, 'rb') as f:
-            content = f.read()
-        
-        image = self._vision.Image(content=content)
-        
-        # Use document_text_detection for better structured output
-        response = self.client.document_text_detection(
-            image=image,
-            image_context={"language_hints": ["hi", "mr", "en"]}
-        )
+        if vision_content is None:
+            vision_content = _shrink_for_vision(content)
+        # DOCUMENT_TEXT_DETECTION for better structured output; concurrent
+        # uploads are sent together as one batch_annotate_images request.
+        response = self._vision_batcher.submit(vision_content)
         
         if response.error.message:
             raise RuntimeError(f"Google Vision error: {response.error.message}")
@@ -106,15 +503,51 @@ class OCRPipeline:
             ocr_engine="google_vision"
         )
     
-    def _tesseract_ocr(self, image_path: str) -> OCRResult:
+    def _acquire_tess_api(self):
+        """Take an idle tesserocr handle, creating one if all are busy."""
+        try:
+            return self._tess_apis.get_nowait()
+        except queue.Empty:
+            pass
+        tesserocr = self._tesserocr
+        try:
+            return tesserocr.PyTessBaseAPI(lang='hin+eng', psm=tesserocr.PSM.AUTO)
+        except RuntimeError:
+            # Fallback to English only
+            return tesserocr.PyTessBaseAPI(lang='eng', psm=tesserocr.PSM.AUTO)
+
+    def _release_tess_api(self, api) -> None:
+        self._tess_apis.put(api)
+
+    def _tesseract_ocr(self, content: bytes, image=None) -> OCRResult:
         """Use Tesseract for OCR (offline fallback)."""
         try:
-            import pytesseract
             from PIL import Image
+            if self._tesserocr is None:
+                import pytesseract
         except Exception as exc:
             raise RuntimeError("Tesseract OCR is not available.") from exc
 
-        img = Image.open(image_path)
+        img = image if image is not None else Image.open(io.BytesIO(content))
+
+        if self._tesserocr is not None:
+            # A handle is not reentrant, so each call holds one exclusively;
+            # concurrent calls get their own handles from the pool.
+            api = self._acquire_tess_api()
+            try:
+                api.SetImage(img)
+                text = api.GetUTF8Text()
+                confidence = api.MeanTextConf() / 100
+            finally:
+                self._release_tess_api(api)
+            lang = self._detect_language(text)
+            return OCRResult(
+                raw_text=text,
+                detected_language=lang,
+                confidence=confidence if confidence > 0 else 0.5,
+                extracted_fields=self._extract_fields(text, lang),
+                ocr_engine="tesseract"
+            )
         
         # Try with Hindi + English
         try:
@@ -132,8 +565,12 @@ class OCRPipeline:
                 img,
                 output_type=pytesseract.Output.DICT
             )
-            confidences = [int(c) for c in data['conf'] if int(c) > 0]
-            confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.5
+            import numpy as np
+            # One vectorised pass; also parses the float confidences newer
+            # Tesseract versions report, which int() rejected.
+            conf = np.asarray(data['conf'], dtype=np.float32)
+            conf = conf[conf > 0]
+            confidence = float(conf.mean()) / 100 if conf.size else 0.5
         except:
             confidence = 0.6
         
@@ -145,11 +582,11 @@ class OCRPipeline:
             ocr_engine="tesseract"
         )
 
-    def _tesseract_cli_ocr(self, image_path: str) -> OCRResult:
+    def _tesseract_cli_ocr(self, content: bytes) -> OCRResult:
         """Use tesseract CLI for OCR (avoids pytesseract imports)."""
         cmd = [
             "tesseract",
-            image_path,
+            "stdin",
             "stdout",
             "-l",
             "eng",
@@ -159,17 +596,18 @@ class OCRPipeline:
         try:
             result = subprocess.run(
                 cmd,
+                input=content,
                 check=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
             )
         except FileNotFoundError as exc:
             raise RuntimeError("tesseract CLI not found. Install tesseract.") from exc
         except subprocess.CalledProcessError as exc:
-            raise RuntimeError(f"tesseract CLI failed: {exc.stderr.strip()}") from exc
+            stderr = exc.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"tesseract CLI failed: {stderr}") from exc
 
-        text = result.stdout
+        text = result.stdout.decode("utf-8", errors="replace")
         lang = self._detect_language(text)
         fields = self._extract_fields(text, lang)
         field_count = sum(1 for value in fields.values() if value)
@@ -187,23 +625,7 @@ class OCRPipeline:
     
     def _detect_language(self, text: str) -> str:
         """Detect primary language from text."""
-        # Check for Devanagari script (Hindi/Marathi)
-        devanagari_chars = sum(1 for c in text if '\u0900' <= c <= '\u097F')
-        total_alpha = sum(1 for c in text if c.isalpha())
-        
-        if total_alpha == 0:
-            return "unknown"
-        
-        devanagari_ratio = devanagari_chars / total_alpha
-        
-        if devanagari_ratio > 0.3:
-            # Could be Hindi or Marathi - check for Marathi-specific words
-            marathi_markers = ['आहे', 'नाही', 'होते', 'असे', 'करणे']
-            if any(marker in text for marker in marathi_markers):
-                return "mr"  # Marathi
-            return "hi"  # Hindi
-        
-        return "en"  # English
+        return _detect_language(text)
     
     def _extract_fields(self, text: str, lang: str) -> Dict:
         """
@@ -232,71 +654,54 @@ class OCRPipeline:
         # Normalize text
         text_normalized = text.replace('\n', ' ').strip()
         
-        # Account number (10-18 digits, not starting with 0)
-        acc_patterns = [
-            r'(?:a/?c|account|खाता)\s*(?:no\.?|number|नं\.?)?\s*:?\s*(\d{10,18})',
-            r'\b([1-9]\d{9,17})\b'
-        ]
-        for pattern in acc_patterns:
-            match = re.search(pattern, text_normalized, re.I)
-            if match:
-                fields["account_number"] = match.group(1)
-                break
+        # Every pattern except the name ones needs a digit, so text without
+        # any (labels, headings, failed OCR) only pays for one scan.
+        if _DIGIT_RE.search(text_normalized):
+            # Account number (10-18 digits, not starting with 0)
+            for pattern in _ACCOUNT_RES:
+                match = pattern.search(text_normalized)
+                if match:
+                    fields["account_number"] = match.group(1)
+                    break
         
-        # IFSC code (4 letters + 0 + 6 alphanumeric)
-        ifsc_match = re.search(r'\b([A-Z]{4}0[A-Z0-9]{6})\b', text_normalized)
-        if ifsc_match:
-            fields["ifsc_code"] = ifsc_match.group(1)
+            # IFSC code (4 letters + 0 + 6 alphanumeric)
+            ifsc_match = _IFSC_RE.search(text_normalized)
+            if ifsc_match:
+                fields["ifsc_code"] = ifsc_match.group(1)
         
-        # Aadhaar (12 digits, often with spaces)
-        aadhaar_patterns = [
-            r'(?:aadhaar|आधार)\s*:?\s*(\d{4}\s?\d{4}\s?\d{4})',
-            r'\b(\d{4}\s?\d{4}\s?\d{4})\b'
-        ]
-        for pattern in aadhaar_patterns:
-            match = re.search(pattern, text_normalized, re.I)
-            if match:
-                aadhaar = match.group(1).replace(" ", "")
-                if len(aadhaar) == 12:
-                    fields["aadhaar"] = aadhaar
-                    break
+            # Aadhaar (12 digits, often with spaces)
+            for pattern in _AADHAAR_RES:
+                match = pattern.search(text_normalized)
+                if match:
+                    aadhaar = match.group(1).replace(" ", "")
+                    if len(aadhaar) == 12:
+                        fields["aadhaar"] = aadhaar
+                        break
         
-        # Survey/Khasra number
-        survey_patterns = [
-            r'(?:survey|khasra|खसरा|सर्वे|गट)\s*(?:no\.?|number|नं\.?|क्र\.?)?\s*:?\s*([0-9]+[\/\-]?[A-Za-z0-9]*)',
-            r'(?:plot|प्लॉट)\s*(?:no\.?)?\s*:?\s*([0-9]+[\/\-]?[A-Za-z0-9]*)'
-        ]
-        for pattern in survey_patterns:
-            match = re.search(pattern, text_normalized, re.I)
-            if match:
-                fields["survey_number"] = match.group(1)
-                break
+            # Survey/Khasra number
+            for pattern in _SURVEY_RES:
+                match = pattern.search(text_normalized)
+                if match:
+                    fields["survey_number"] = match.group(1)
+                    break
         
-        # Area in acres/hectares
-        area_patterns = [
-            r'(\d+\.?\d*)\s*(acres?|hectares?|एकड़|हेक्टेयर|गुंठे|आर)',
-            r'(?:area|क्षेत्र)\s*:?\s*(\d+\.?\d*)\s*(acres?|hectares?|एकड़|हेक्टेयर)?'
-        ]
-        for pattern in area_patterns:
-            match = re.search(pattern, text_normalized, re.I)
-            if match:
-                area_value = match.group(1)
-                area_unit = match.group(2) if len(match.groups()) > 1 else "units"
-                fields["area"] = f"{area_value} {area_unit or 'units'}"
-                break
+            # Area in acres/hectares
+            for pattern in _AREA_RES:
+                match = pattern.search(text_normalized)
+                if match:
+                    area_value = match.group(1)
+                    area_unit = match.group(2) if len(match.groups()) > 1 else "units"
+                    fields["area"] = f"{area_value} {area_unit or 'units'}"
+                    break
         
-        # Phone number (Indian format)
-        phone_match = re.search(r'(?:\+91|91)?[- ]?([6-9]\d{9})\b', text_normalized)
-        if phone_match:
-            fields["phone"] = phone_match.group(1)
+            # Phone number (Indian format)
+            phone_match = _PHONE_RE.search(text_normalized)
+            if phone_match:
+                fields["phone"] = phone_match.group(1)
         
         # Name extraction (heuristic - look for common patterns)
-        name_patterns = [
-            r'(?:name|नाम|नांव)\s*:?\s*([^\n,\d]{3,50})',
-            r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,3})'  # English name at start
-        ]
-        for pattern in name_patterns:
-            match = re.search(pattern, text, re.I | re.M)
+        for pattern in _NAME_RES:
+            match = pattern.search(text)
             if match:
                 name = match.group(1).strip()
                 # Filter out common non-name words
@@ -308,12 +713,15 @@ class OCRPipeline:
 
 
 # Convenience function for direct use
-def extract_document_text(image_path: str, use_google: bool = True) -> OCRResult:
+def extract_document_text(
+    image_path: Union[str, bytes, BinaryIO],
+    use_google: bool = True,
+) -> OCRResult:
     """
     Convenience function to extract text from a document image.
     
     Args:
-        image_path: Path to image
+        image_path: Path to image, encoded image bytes, or a binary file object
         use_google: Whether to use Google Vision (requires API key)
     
     Returns:
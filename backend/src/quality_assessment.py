@@ -3,9 +3,14 @@ Quality Assessment Module
 Checks photo quality before OCR processing.
 """
 
+import hashlib
+import io
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import BinaryIO, List, Optional, Union
 from PIL import Image, ImageFilter
 
 
@@ -15,27 +20,113 @@ class QualityReport:
     blur_score: float      # 0-100, higher = sharper
     brightness_score: float # 0-100, 50 = optimal
     glare_score: float     # 0-100, higher = less glare
-    angle_score: float     # 0-100, higher = more straight
+    angle_score: Optional[float]  # 0-100, higher = more straight; None if not checked
     resolution_ok: bool
     issues: List[str]
     suggestions: List[str]
 
 
-def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityReport:
+def assess_quality(
+    image_path: Union[str, bytes, BinaryIO],
+    min_blur_threshold: float = 30,
+) -> QualityReport:
     """
     Assess the quality of a document image.
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, encoded image bytes, or a binary
+            file object (e.g. an upload's spooled file)
         min_blur_threshold: Minimum acceptable blur score (0-100)
     
+    Returns:
+        QualityReport with scores and recommendations
+    """
+    if isinstance(image_path, (bytes, bytearray)):
+        content = bytes(image_path)
+    elif hasattr(image_path, "read"):
+        content = image_path.read()
+    else:
+        try:
+            with open(image_path, 'rb') as f:
+                content = f.read()
+        except OSError:
+            content = b""
+    return assess_quality_bytes(content, min_blur_threshold)
+
+
+def assess_quality_batch(
+    images: List[Union[str, bytes, BinaryIO]],
+    min_blur_threshold: float = 30,
+) -> List[QualityReport]:
+    """
+    Assess many document images, one per CPU core at a time.
+    
+    The OpenCV work releases the GIL, so a thread pool scales with cores
+    without pickling image bytes across processes.
+    
+    Args:
+        images: Paths, encoded image bytes or binary file objects
+        min_blur_threshold: Minimum acceptable blur score (0-100)
+    
+    Returns:
+        QualityReports in input order
+    """
+    workers = min(len(images), os.cpu_count() or 1)
+    if workers <= 1:
+        return [assess_quality(image, min_blur_threshold) for image in images]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda image: assess_quality(image, min_blur_threshold), images))
+
+
+# Reports for recently assessed images, keyed by content digest (retries and
+# duplicate uploads of the same photo skip the pixel work).
+_CACHE_SIZE = 512
+_cache: "OrderedDict[tuple, QualityReport]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def assess_quality_bytes(
+    content: bytes,
+    min_blur_threshold: float = 30,
+    digest: Optional[bytes] = None,
+) -> QualityReport:
+    """
+    Assess the quality of an encoded (JPG/PNG) document image held in memory.
+    
+    Args:
+        content: Encoded image bytes
+        min_blur_threshold: Minimum acceptable blur score (0-100)
+        digest: BLAKE2b digest of content, if the caller already has one
+    
     Returns:
         QualityReport with scores and recommendations
     """
     mode = os.getenv("QUALITY_ASSESSMENT_MODE", "opencv").lower()
+    if digest is None:
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+    key = (digest, min_blur_threshold, mode)
+    with _cache_lock:
+        report = _cache.get(key)
+        if report is not None:
+            _cache.move_to_end(key)
+            return report
+
+    report = _assess_quality(content, min_blur_threshold, mode)
+    with _cache_lock:
+        _cache[key] = report
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return report
+
+
+# Longest edge (px) of the copy used for Canny/Hough skew detection.
+_SKEW_MAX_EDGE = 1024
+
+
+def _assess_quality(content: bytes, min_blur_threshold: float, mode: str) -> QualityReport:
     if mode == "stub":
         try:
-            img = Image.open(image_path)
+            img = Image.open(io.BytesIO(content))
         except Exception:
             return QualityReport(
                 is_acceptable=False,
@@ -117,8 +208,12 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
     import cv2
     import numpy as np
 
-    img = cv2.imread(image_path)
-    if img is None:
+    # Decode straight to grayscale: every metric below reads only luma, so
+    # the BGR buffer and the cvtColor copy are pure memory traffic.
+    gray = None
+    if content:
+        gray = cv2.imdecode(np.frombuffer(content, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
         return QualityReport(
             is_acceptable=False,
             blur_score=0,
@@ -130,14 +225,16 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
             suggestions=["Please upload a valid JPG or PNG image"]
         )
     
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    height, width = img.shape[:2]
+    height, width = gray.shape
     
     issues = []
     suggestions = []
     
     # 1. Blur Detection (Laplacian variance)
-    laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+    # A 3x3 Laplacian of 8-bit input fits in int16; meanStdDev reduces it in
+    # one pass without the 8-byte-per-pixel float64 intermediate.
+    _, lap_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    laplacian_var = float(lap_std[0, 0]) ** 2
     blur_score = min(100, laplacian_var / 5)  # Normalize to 0-100
     
     if blur_score < min_blur_threshold:
@@ -145,7 +242,7 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
         suggestions.append("Hold camera steady and ensure document is in focus")
     
     # 2. Brightness Check
-    brightness = np.mean(gray)
+    brightness = cv2.mean(gray)[0]
     brightness_score = 100 - abs(brightness - 127) / 1.27  # 127 = optimal
     
     if brightness < 50:
@@ -157,7 +254,7 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
     
     # 3. Glare Detection (highlight analysis)
     _, highlights = cv2.threshold(gray, 250, 255, cv2.THRESH_BINARY)
-    glare_percentage = np.sum(highlights) / (gray.size * 255) * 100
+    glare_percentage = cv2.countNonZero(highlights) / gray.size * 100
     glare_score = max(0, 100 - glare_percentage * 10)
     
     if glare_percentage > 5:
@@ -172,19 +269,37 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
         suggestions.append("Move closer to document or use higher camera quality")
     
     # 5. Angle/Skew Detection (Hough transform)
-    edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-    lines = cv2.HoughLines(edges, 1, np.pi/180, 100)
-    angle_score = 100  # Assume good
+    # Skew can only add an issue, so skip Canny/Hough entirely when the
+    # checks above have already rejected the image (angle_score stays None:
+    # not measured, rather than a claim that the document is straight).
+    angle_score = None
+    already_rejected = (
+        blur_score < min_blur_threshold or
+        not resolution_ok or
+        glare_score <= 50 or
+        len(issues) > 2
+    )
     
-    if lines is not None and len(lines) > 0:
-        angles = [line[0][1] * 180 / np.pi for line in lines[:10]]
-        avg_angle = np.mean(angles)
-        skew = abs(90 - avg_angle) if avg_angle > 45 else abs(avg_angle)
+    if not already_rejected:
+        angle_score = 100  # Assume good
+        # Skew is a global property, so detect it on a downsampled copy; line
+        # angles are scale-invariant, only the vote threshold scales with length.
+        scale = min(1.0, _SKEW_MAX_EDGE / max(height, width))
+        small = gray
+        if scale < 1.0:
+            small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        edges = cv2.Canny(small, 50, 150, apertureSize=3)
+        lines = cv2.HoughLines(edges, 1, np.pi/180, max(1, int(100 * scale)))
         
-        if skew > 10:
-            angle_score = max(0, 100 - skew * 5)
-            issues.append(f"Document is tilted ({skew:.1f}°)")
-            suggestions.append("Align document edges with camera frame")
+        if lines is not None and len(lines) > 0:
+            angles = [line[0][1] * 180 / np.pi for line in lines[:10]]
+            avg_angle = np.mean(angles)
+            skew = abs(90 - avg_angle) if avg_angle > 45 else abs(avg_angle)
+            
+            if skew > 10:
+                angle_score = max(0, 100 - skew * 5)
+                issues.append(f"Document is tilted ({skew:.1f}°)")
+                suggestions.append("Align document edges with camera frame")
     
     # Determine acceptability
     is_acceptable = (
@@ -199,20 +314,26 @@ def assess_quality(image_path: str, min_blur_threshold: float = 30) -> QualityRe
         blur_score=round(blur_score, 1),
         brightness_score=round(brightness_score, 1),
         glare_score=round(glare_score, 1),
-        angle_score=round(angle_score, 1),
+        angle_score=round(angle_score, 1) if angle_score is not None else None,
         resolution_ok=resolution_ok,
         issues=issues,
         suggestions=suggestions if not is_acceptable else []
     )
 
 
-def preprocess_image(image_path: str, output_path: str = None) -> str:
+def preprocess_image(
+    image_path: str,
+    output_path: str = None,
+    quality_level: str = "fast",
+) -> str:
     """
     Preprocess image for better OCR results.
     
     Args:
         image_path: Path to input image
         output_path: Path for processed image (optional)
+        quality_level: "fast" (bilateral filter) or "high" (non-local means
+            denoising, much slower)
     
     Returns:
         Path to processed image
@@ -223,13 +344,14 @@ def preprocess_image(image_path: str, output_path: str = None) -> str:
 
     import cv2
 
-    img = cv2.imread(image_path)
-    
-    # Convert to grayscale
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
     
-    # Denoise
-    denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    # Denoise (edge-preserving bilateral filter; adaptive thresholding below
+    # hides the difference from non-local means for typical documents)
+    if quality_level == "high":
+        denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
+    else:
+        denoised = cv2.bilateralFilter(gray, 5, 50, 50)
     
     # Increase contrast using CLAHE
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
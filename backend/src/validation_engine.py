@@ -4,26 +4,153 @@ Validates extracted data against farmer database using fuzzy matching.
 """
 
 import json
-import os
 import re
-import difflib
-from db import list_farmers
-from dataclasses import dataclass
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from rapidfuzz import fuzz, process
+from db import farmers_version, find_farmers_in, list_farmers
+from dataclasses import dataclass, replace
 from typing import Optional, Dict, List, Union
 from pathlib import Path
 
+_IFSC_RE = re.compile(r'^[A-Z]{4}0[A-Z0-9]{6}$')
+_PHONE_RE = re.compile(r'^(?:\+?91|0)?[6-9]\d{9}$')
+
+# Weights of each field in _calculate_match_score's weighted average.
+_NAME_WEIGHT = 2.0
+# Minimum weighted score for a fuzzy match to count as the farmer.
+_MATCH_THRESHOLD = 60
+_FIELD_WEIGHTS = {'account_number': 1.5, 'survey_number': 1.0, 'phone': 1.0}
+
+
 def _ratio(a: str, b: str) -> int:
     if not a or not b:
         return 0
-    return int(difflib.SequenceMatcher(None, a, b).ratio() * 100)
+    return int(fuzz.ratio(a, b))
 
 
 def _token_sort_ratio(a: str, b: str) -> int:
     if not a or not b:
         return 0
-    a_tokens = " ".join(sorted(a.split()))
-    b_tokens = " ".join(sorted(b.split()))
-    return _ratio(a_tokens, b_tokens)
+    return int(fuzz.token_sort_ratio(a, b))
+
+
+def _id_key(value) -> str:
+    """Account/Aadhaar number without the spaces and dashes OCR and data
+    entry put in them."""
+    return str(value).replace(' ', '').replace('-', '')
+
+
+def _phone_key(value) -> str:
+    """Phone number as its last 10 digits (drops +91 / 0 prefixes)."""
+    return ''.join(c for c in str(value) if c.isdigit())[-10:]
+
+
+def _normalize_extracted(fields: Dict) -> Dict:
+    """fields with the scored identifiers (_FIELD_WEIGHTS) as str, copying
+    only if one is not already, so scoring never has to coerce per farmer."""
+    if all(type(fields.get(f)) in (str, type(None)) for f in _FIELD_WEIGHTS):
+        return fields
+    fields = dict(fields)
+    for field in _FIELD_WEIGHTS:
+        if fields.get(field) is not None:
+            fields[field] = str(fields[field])
+    return fields
+
+
+def _all_ascii_digits(value: str) -> bool:
+    """True if value is non-empty and only 0-9 (isdigit() alone also admits
+    superscripts and other scripts' digits; isascii() is a flag check)."""
+    return value.isascii() and value.isdigit()
+
+
+def _sorted_tokens(name: str) -> str:
+    """Lowercased name with its tokens sorted, as token_sort_ratio compares it."""
+    return " ".join(sorted(name.lower().split()))
+
+
+# Upper bound on the score matrix validate_batch holds at once (bytes).
+_BATCH_SCORES_BYTES = 64 * 1024 * 1024
+
+
+# Name-match results for recently validated documents, keyed by the fields
+# _calculate_match_score reads, so retries and re-uploads skip the fuzzy scan.
+_MATCH_CACHE_SIZE = 4096
+_MATCH_KEY_FIELDS = ('name', 'account_number', 'survey_number', 'phone')
+
+
+# Farmer fields whose values repeat across many records (same bank branch,
+# village, ...); interned at index build so each distinct value is stored once.
+_SHARED_VALUE_FIELDS = ('village', 'district', 'state', 'ifsc_code', 'bank_name')
+
+
+# Farmer lists at least this long are narrowed with _phonetic_keys buckets
+# before fuzzy scoring; smaller ones are always scanned in full.
+_PREFILTER_MIN_FARMERS = 5000
+
+_SOUNDEX_CODES = {
+    letter: digit
+    for digit, letters in (
+        ('1', 'bfpv'), ('2', 'cgjkqsxz'), ('3', 'dt'), ('4', 'l'), ('5', 'mn'), ('6', 'r'),
+    )
+    for letter in letters
+}
+
+
+def _soundex(token: str) -> Optional[str]:
+    """American Soundex code of the ASCII letters in token, or None."""
+    letters = [c for c in token.lower() if 'a' <= c <= 'z']
+    if not letters:
+        return None
+    code = letters[0].upper()
+    last = _SOUNDEX_CODES.get(letters[0])
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c)
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if c not in 'hw':
+            last = digit
+    return code.ljust(4, '0')
+
+
+def _phonetic_keys(name: str) -> set:
+    """Soundex and two-letter prefix keys for each token of a name."""
+    keys = set()
+    for token in name.lower().split():
+        keys.add('p:' + token[:2])
+        code = _soundex(token)
+        if code:
+            keys.add('s:' + code)
+    return keys
+
+
+@dataclass(frozen=True)
+class _NameIndex:
+    """
+    A farmer list with the sorted-token forms of each farmer's name and
+    name_en ('' when missing) and, once built, its _phonetic_keys buckets
+    (plus, under None, the farmers without a name).
+
+    Never mutated: the engine publishes a new one in a single attribute
+    assignment, so concurrent validations always see a list and keys that
+    belong together.
+    """
+    farmers: List[Dict]
+    name_keys: List[str]
+    name_en_keys: List[str]
+    phonetic: Optional[Dict[Optional[str], List[int]]] = None
+
+
+def _name_index(farmers: List[Dict]) -> _NameIndex:
+    return _NameIndex(
+        farmers,
+        [_sorted_tokens(farmer.get('name') or '') for farmer in farmers],
+        [_sorted_tokens(farmer.get('name_en') or '') for farmer in farmers],
+    )
 
 
 @dataclass
@@ -47,44 +174,258 @@ class ValidationEngine:
         Initialize with farmer database.
         
         Args:
-            farmer_database: Path to JSON file or list of farmer records
+            farmer_database: Path to JSON file, SQLite .db file, or list of farmer records
         """
         self._db_mode = False
+        self._db_path = None
+        self._match_cache_lock = threading.Lock()
         if isinstance(farmer_database, str):
             if farmer_database.endswith(".db"):
                 self._db_mode = True
-                self.farmers = list_farmers()
+                self._db_path = farmer_database
+                self._farmers_version = farmers_version(farmer_database)
+                self.farmers = list_farmers(farmer_database)
             else:
                 with open(farmer_database, 'r', encoding='utf-8') as f:
                     self.farmers = json.load(f)
         else:
-            self.farmers = farmer_database
-
-        self._use_rapidfuzz = os.getenv("USE_RAPIDFUZZ", "true").lower() == "true"
-        self._fuzz = None
-        self._process = None
-        if self._use_rapidfuzz:
-            from rapidfuzz import fuzz, process
-            self._fuzz = fuzz
-            self._process = process
+            # Shallow copies: _build_indices normalizes records in place, and
+            # the caller's own dicts must stay as they were passed in.
+            self.farmers = [dict(farmer) for farmer in farmer_database]
         
         # Build lookup indices for faster matching
         self._build_indices()
     
     def _build_indices(self):
-        """Build lookup indices for common fields."""
-        self.account_index = {}
-        self.aadhaar_index = {}
-        self.phone_index = {}
+        """Build lookup indices for common fields, keyed by normalized value."""
+        # Indices are built aside and then published, so threads validating
+        # meanwhile keep using complete ones.
+        farmers = self.farmers
+        account_index = {}
+        aadhaar_index = {}
+        phone_index = {}
         
-        for farmer in self.farmers:
+        for farmer in farmers:
+            for field in _SHARED_VALUE_FIELDS:
+                value = farmer.get(field)
+                if type(value) is str:
+                    farmer[field] = sys.intern(value)
+            # Scored identifiers are compared as text (SQLite rows already are).
+            for field in _FIELD_WEIGHTS:
+                value = farmer.get(field)
+                if value is not None and type(value) is not str:
+                    farmer[field] = str(value)
             if farmer.get('account_number'):
-                self.account_index[farmer['account_number']] = farmer
+                account_index[_id_key(farmer['account_number'])] = farmer
             if farmer.get('aadhaar'):
-                self.aadhaar_index[farmer['aadhaar']] = farmer
+                aadhaar_index[_id_key(farmer['aadhaar'])] = farmer
             if farmer.get('phone'):
-                self.phone_index[farmer['phone']] = farmer
+                phone_index[_phone_key(farmer['phone'])] = farmer
+        
+        self.account_index = account_index
+        self.aadhaar_index = aadhaar_index
+        self.phone_index = phone_index
+        # Name keys are static per farmer list, so sort tokens once here
+        # rather than inside token_sort_ratio on every comparison.
+        self._names = _name_index(farmers)
+        self._match_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
     
+    def _lookup_account(self, account_number: str) -> Optional[Dict]:
+        """Exact account lookup; an indexed SQLite query in db mode."""
+        if self._db_mode:
+            # Stored values are not normalized, so match either form.
+            matches = find_farmers_in(
+                'account_number', [account_number, _id_key(account_number)], self._db_path
+            )
+            return matches[0] if matches else None
+        return self.account_index.get(_id_key(account_number))
+
+    def _match_name(self, extracted_fields: Dict) -> tuple:
+        """
+        _best_name_match against the farmers worth scoring.
+
+        In db mode, farmers sharing the extracted phone number are fetched
+        through its index and scored first; the full table is scanned when
+        there are none or none of them reaches _MATCH_THRESHOLD.
+        """
+        if self._db_mode:
+            shortlist = self._shortlist(extracted_fields)
+            if shortlist:
+                match = self._best_name_match(extracted_fields, _name_index(shortlist))
+                if match[1] >= _MATCH_THRESHOLD:
+                    return match
+            self._refresh_farmers()
+        return self._best_name_match(extracted_fields, self._names)
+
+    def _refresh_farmers(self) -> None:
+        """Reload farmers and indices in db mode if the table has changed."""
+        version = farmers_version(self._db_path)
+        if version is not None and version == self._farmers_version:
+            return
+        # Version read first: a write racing the reload just costs another.
+        self._farmers_version = version
+        self.farmers = list_farmers(self._db_path)
+        self._build_indices()
+
+    def _phonetic_candidates(self, name: str, names: _NameIndex) -> List[int]:
+        """
+        Indices of farmers sharing a Soundex code or two-letter token prefix
+        with name, in list order.
+
+        This prunes large lists before fuzzy scoring at the cost of missing
+        matches whose every token is spelled differently from the start; the
+        caller falls back to a full scan when nothing shares a key. Farmers
+        without a name are scored on their other fields alone, so they are
+        always kept.
+        """
+        index = names.phonetic
+        if index is None:
+            index = {}
+            for i, farmer in enumerate(names.farmers):
+                if not farmer.get('name'):
+                    index.setdefault(None, []).append(i)
+                keys = _phonetic_keys(farmer.get('name') or '')
+                keys |= _phonetic_keys(farmer.get('name_en') or '')
+                for key in keys:
+                    index.setdefault(key, []).append(i)
+            # Keep the buckets with the engine's list unless it was replaced
+            # meanwhile (a racing thread building them too is harmless).
+            if self._names is names:
+                self._names = replace(names, phonetic=index)
+        matched = set()
+        for key in _phonetic_keys(name):
+            matched.update(index.get(key, ()))
+        if matched:
+            matched.update(index.get(None, ()))
+        return sorted(matched)
+
+    def _shortlist(self, extracted_fields: Dict) -> List[Dict]:
+        """Farmers sharing the extracted phone number (db mode). Survey
+        numbers are not unique, so they never narrow the search."""
+        phone = extracted_fields.get('phone')
+        if not phone:
+            return []
+        # Stored values are not normalized, so match either form.
+        return find_farmers_in('phone', [phone, _phone_key(phone)], self._db_path)
+
+    def _best_name_match(self, extracted: Dict, names: _NameIndex, scores=None):
+        """
+        Return (farmer, score) maximising _calculate_match_score, or (None, 0).
+
+        Name similarity for every farmer comes from one rapidfuzz cdist call.
+        Full weighted scores are then computed in descending name-score order
+        only while a farmer's best possible score (its name score with every
+        other field matching exactly) can still beat the best found so far.
+        Ties go to the earlier farmer, as in a plain scan. Lists of at least
+        _PREFILTER_MIN_FARMERS are first narrowed by _phonetic_candidates.
+        
+        scores, if given, is this query's precomputed fuzz.ratio row against
+        names' name keys followed by their name_en keys.
+        """
+        query = _sorted_tokens(extracted['name'])
+        farmers = names.farmers
+        name_keys, name_en_keys = names.name_keys, names.name_en_keys
+        candidates = range(len(farmers))
+        if len(farmers) >= _PREFILTER_MIN_FARMERS:
+            candidates = self._phonetic_candidates(extracted['name'], names) or candidates
+        named = [i for i in candidates if farmers[i].get('name')]
+        # Farmers without a name are scored on their other fields alone.
+        unnamed = [i for i in candidates if not farmers[i].get('name')]
+
+        other_weight = sum(w for f, w in _FIELD_WEIGHTS.items() if extracted.get(f))
+
+        def upper_bound(name_score):
+            # Best possible weighted score: every other field matching exactly.
+            return (
+                (_NAME_WEIGHT * name_score + 100 * other_weight)
+                / (_NAME_WEIGHT + other_weight)
+            )
+
+        # Try first with a name-score cutoff below which a farmer could not
+        # reach _MATCH_THRESHOLD even with every other field matching, so
+        # rapidfuzz can abandon hopeless comparisons early. That pass is only
+        # conclusive if it finds a farmer at the threshold; otherwise the
+        # exact scores of the weaker names matter and the scan is redone.
+        cutoff = max(
+            0.0,
+            (_MATCH_THRESHOLD * (_NAME_WEIGHT + other_weight) - 100 * other_weight)
+            / _NAME_WEIGHT,
+        )
+        if scores is not None or cutoff <= 0:
+            cutoffs = (0.0,)
+        else:
+            cutoffs = (cutoff, 0.0)
+        for score_cutoff in cutoffs:
+            best_idx, best_score = None, 0
+
+            def consider(idx, name_score=None):
+                nonlocal best_idx, best_score
+                score = self._calculate_match_score(extracted, farmers[idx], name_score)
+                if score > best_score or (score == best_score and best_idx is not None and idx < best_idx):
+                    best_idx, best_score = idx, score
+
+            for idx in unnamed:
+                consider(idx)
+
+            if named:
+                if scores is not None:
+                    positions = np.array(named)
+                    row = np.concatenate((scores[positions], scores[positions + len(farmers)]))
+                else:
+                    # ratio on pre-sorted keys is token_sort_ratio without re-sorting.
+                    row = process.cdist(
+                        [query],
+                        [name_keys[i] for i in named] + [name_en_keys[i] for i in named],
+                        scorer=fuzz.ratio,
+                        dtype=np.float64,
+                        score_cutoff=score_cutoff,
+                    )[0]
+                # English names only count where present; scores are truncated
+                # to int as in _calculate_match_score.
+                has_en = np.array([bool(farmers[i].get('name_en')) for i in named])
+                en_scores = np.where(has_en, row[len(named):], 0)
+                name_scores = np.floor(np.maximum(row[:len(named)], en_scores))
+
+                for pos in np.argsort(-name_scores, kind='stable'):
+                    if upper_bound(name_scores[pos]) < best_score - 1e-9:
+                        break
+                    if name_scores[pos] < score_cutoff:
+                        break
+                    consider(named[pos], int(name_scores[pos]))
+
+            if best_score >= _MATCH_THRESHOLD:
+                break
+
+        if best_idx is None:
+            return None, 0
+        return farmers[best_idx], best_score
+
+    def _cached_name_match(self, extracted_fields: Dict) -> tuple:
+        """
+        _match_name, memoized on the fields it reads (and, in db mode, the
+        farmers table version; without one, changes cannot be detected and
+        nothing is cached).
+        """
+        key = tuple(extracted_fields.get(f) for f in _MATCH_KEY_FIELDS)
+        if self._db_mode:
+            version = farmers_version(self._db_path)
+            if version is None:
+                return self._match_name(extracted_fields)
+            key += (version,)
+        cache = self._match_cache
+        with self._match_cache_lock:
+            match = cache.get(key)
+            if match is not None:
+                cache.move_to_end(key)
+                return match
+
+        match = self._match_name(extracted_fields)
+        with self._match_cache_lock:
+            cache[key] = match
+            if len(cache) > _MATCH_CACHE_SIZE:
+                cache.popitem(last=False)
+        return match
+
     def validate(self, extracted_fields: Dict) -> ValidationResult:
         """
         Validate extracted fields against farmer database.
@@ -95,10 +436,96 @@ class ValidationEngine:
         Returns:
             ValidationResult with match details and issues
         """
+        extracted_fields = _normalize_extracted(extracted_fields)
+        account_farmer = None
+        if extracted_fields.get('account_number'):
+            account_farmer = self._lookup_account(extracted_fields['account_number'])
+        return self._validate(extracted_fields, account_farmer)
+
+    def validate_batch(self, rows: List[Dict]) -> List[ValidationResult]:
+        """
+        Validate many documents' extracted fields at once.
+        
+        Gives the same results as calling validate() on each row, but
+        resolves account numbers with one hash join (one SQL query in db
+        mode) and scores all names that need fuzzy matching against the
+        shared farmer list in a single multi-threaded rapidfuzz cdist call.
+        
+        Args:
+            rows: Extracted field dicts, one per document
+            
+        Returns:
+            ValidationResults in input order
+        """
+        rows = [_normalize_extracted(row) for row in rows]
+        accounts = [row.get('account_number') for row in rows]
         if self._db_mode:
-            self.farmers = list_farmers()
-            self._build_indices()
+            # Stored values are not normalized, so match either form and,
+            # as in _lookup_account, take the lowest farmer id.
+            account_index = {}
+            wanted = accounts + [_id_key(acc) for acc in accounts if acc]
+            for farmer in find_farmers_in('account_number', wanted, self._db_path):
+                account_index.setdefault(farmer['account_number'], farmer)
+            account_farmers = []
+            for acc in accounts:
+                found = [
+                    account_index[key] for key in (acc, _id_key(acc) if acc else None)
+                    if key in account_index
+                ]
+                account_farmers.append(min(found, key=lambda f: f['id']) if found else None)
+        else:
+            account_farmers = [
+                self.account_index.get(_id_key(acc)) if acc else None for acc in accounts
+            ]
+
+        # Rows that will reach the fuzzy name match, grouped by candidate list.
+        name_matches: List[Optional[tuple]] = [None] * len(rows)
+        shared_rows = []
+        for i, row in enumerate(rows):
+            if account_farmers[i] or not row.get('name'):
+                continue
+            if row.get('aadhaar') and _id_key(row['aadhaar']) in self.aadhaar_index:
+                continue
+            shortlist = self._shortlist(row) if self._db_mode else None
+            if shortlist:
+                match = self._best_name_match(row, _name_index(shortlist))
+                if match[1] >= _MATCH_THRESHOLD:
+                    name_matches[i] = match
+                    continue
+            shared_rows.append(i)
 
+        if shared_rows:
+            if self._db_mode:
+                self._refresh_farmers()
+            names = self._names
+            choices = names.name_keys + names.name_en_keys
+            # Score in row chunks so the float64 matrix stays within budget
+            # however large the batch and the farmer table get.
+            chunk = max(1, _BATCH_SCORES_BYTES // (8 * max(1, len(choices))))
+            for start in range(0, len(shared_rows), chunk):
+                part = shared_rows[start:start + chunk]
+                scores = process.cdist(
+                    [_sorted_tokens(rows[i]['name']) for i in part],
+                    choices,
+                    scorer=fuzz.ratio,
+                    dtype=np.float64,
+                    workers=-1,
+                )
+                for i, row_scores in zip(part, scores):
+                    name_matches[i] = self._best_name_match(rows[i], names, row_scores)
+
+        return [
+            self._validate(row, account_farmers[i], name_matches[i])
+            for i, row in enumerate(rows)
+        ]
+
+    def _validate(
+        self,
+        extracted_fields: Dict,
+        account_farmer: Optional[Dict],
+        name_match: Optional[tuple] = None,
+    ) -> ValidationResult:
+        """validate() with the account lookup (and optionally name match) done."""
         issues = []
         warnings = []
         field_matches = {}
@@ -106,21 +533,19 @@ class ValidationEngine:
         best_score = 0
         
         # Try exact match on unique identifiers first
-        if extracted_fields.get('account_number'):
-            acc = extracted_fields['account_number']
-            if acc in self.account_index:
-                best_match = self.account_index[acc]
-                best_score = 100
-                field_matches['account_number'] = {
-                    'valid': True, 
-                    'confidence': 1.0,
-                    'match_type': 'exact'
-                }
+        if account_farmer:
+            best_match = account_farmer
+            best_score = 100
+            field_matches['account_number'] = {
+                'valid': True, 
+                'confidence': 1.0,
+                'match_type': 'exact'
+            }
         
         if not best_match and extracted_fields.get('aadhaar'):
             aadhaar = extracted_fields['aadhaar']
-            if aadhaar in self.aadhaar_index:
-                best_match = self.aadhaar_index[aadhaar]
+            if _id_key(aadhaar) in self.aadhaar_index:
+                best_match = self.aadhaar_index[_id_key(aadhaar)]
                 best_score = 100
                 field_matches['aadhaar'] = {
                     'valid': True,
@@ -130,12 +555,9 @@ class ValidationEngine:
         
         # Fuzzy match on name if no exact match yet
         if not best_match and extracted_fields.get('name'):
-            name = extracted_fields['name']
-            for farmer in self.farmers:
-                score = self._calculate_match_score(extracted_fields, farmer)
-                if score > best_score:
-                    best_score = score
-                    best_match = farmer
+            if name_match is None:
+                name_match = self._cached_name_match(extracted_fields)
+            best_match, best_score = name_match
         
         # Validate individual field formats
         field_validations = self._validate_field_formats(extracted_fields)
@@ -143,78 +565,82 @@ class ValidationEngine:
         issues.extend(field_validations['issues'])
         
         # Cross-validate with best match
-        if best_match and best_score > 60:
+        if best_match and best_score >= _MATCH_THRESHOLD:
             cross_validation = self._cross_validate(extracted_fields, best_match)
             issues.extend(cross_validation['issues'])
             warnings.extend(cross_validation['warnings'])
-        elif best_score <= 60 and extracted_fields.get('name'):
+        elif best_score < _MATCH_THRESHOLD and extracted_fields.get('name'):
             warnings.append(f"No confident match found for '{extracted_fields['name']}'")
         
         # Determine overall validity
         critical_issues = [i for i in issues if not i.startswith("Minor:")]
-        is_valid = len(critical_issues) == 0 and best_score >= 60
+        is_valid = len(critical_issues) == 0 and best_score >= _MATCH_THRESHOLD
         
         return ValidationResult(
             is_valid=is_valid,
             confidence=best_score / 100,
-            matched_farmer=best_match if best_score >= 60 else None,
+            matched_farmer=best_match if best_score >= _MATCH_THRESHOLD else None,
             field_matches=field_matches,
             issues=issues,
             warnings=warnings
         )
     
-    def _calculate_match_score(self, extracted: Dict, farmer: Dict) -> float:
-        """Calculate fuzzy match score between extracted and database record."""
+    def _calculate_match_score(
+        self,
+        extracted: Dict,
+        farmer: Dict,
+        name_score: Optional[int] = None,
+    ) -> float:
+        """
+        Calculate fuzzy match score between extracted and database record.
+
+        name_score, if given, is the already-computed name similarity.
+        """
         scores = []
         weights = []
         
         # Name matching (highest weight)
-        if extracted.get('name') and farmer.get('name'):
+        if name_score is not None:
+            scores.append(name_score)
+            weights.append(_NAME_WEIGHT)
+        elif extracted.get('name') and farmer.get('name'):
             # Try both original and English name
-            name_score = self._token_sort_ratio(
-                extracted['name'].lower(),
-                farmer['name'].lower()
-            )
+            query = _sorted_tokens(extracted['name'])
+            name_score = int(fuzz.ratio(query, _sorted_tokens(farmer['name'])))
             
             if farmer.get('name_en'):
-                name_score_en = self._token_sort_ratio(
-                    extracted['name'].lower(),
-                    farmer['name_en'].lower()
-                )
+                name_score_en = int(fuzz.ratio(query, _sorted_tokens(farmer['name_en'])))
                 name_score = max(name_score, name_score_en)
             
             scores.append(name_score)
-            weights.append(2.0)  # Double weight for name
+            weights.append(_NAME_WEIGHT)  # Double weight for name
         
         # Account number (exact or close)
         if extracted.get('account_number') and farmer.get('account_number'):
-            if extracted['account_number'] == farmer['account_number']:
+            extracted_acc = _id_key(extracted['account_number'])
+            farmer_acc = _id_key(farmer['account_number'])
+            if extracted_acc == farmer_acc:
                 scores.append(100)
             else:
                 # Allow for minor typos
-                acc_score = self._ratio(
-                    extracted['account_number'],
-                    farmer['account_number']
-                )
-                scores.append(acc_score)
-            weights.append(1.5)
+                scores.append(_ratio(extracted_acc, farmer_acc))
+            weights.append(_FIELD_WEIGHTS['account_number'])
         
         # Survey number
         if extracted.get('survey_number') and farmer.get('survey_number'):
-            survey_score = self._ratio(
-                str(extracted['survey_number']),
-                str(farmer['survey_number'])
-            )
+            survey_score = _ratio(extracted['survey_number'], farmer['survey_number'])
             scores.append(survey_score)
-            weights.append(1.0)
+            weights.append(_FIELD_WEIGHTS['survey_number'])
         
         # Phone number
         if extracted.get('phone') and farmer.get('phone'):
-            if extracted['phone'] == farmer['phone']:
+            extracted_phone = _phone_key(extracted['phone'])
+            farmer_phone = _phone_key(farmer['phone'])
+            if extracted_phone == farmer_phone:
                 scores.append(100)
             else:
-                scores.append(self._ratio(extracted['phone'], farmer['phone']))
-            weights.append(1.0)
+                scores.append(_ratio(extracted_phone, farmer_phone))
+            weights.append(_FIELD_WEIGHTS['phone'])
         
         if not scores:
             return 0
@@ -274,11 +700,10 @@ class ValidationEngine:
         
         # Check account number mismatch
         if extracted.get('account_number') and farmer.get('account_number'):
-            if extracted['account_number'] != farmer['account_number']:
-                similarity = self._ratio(
-                    extracted['account_number'],
-                    farmer['account_number']
-                )
+            extracted_acc = _id_key(extracted['account_number'])
+            farmer_acc = _id_key(farmer['account_number'])
+            if extracted_acc != farmer_acc:
+                similarity = _ratio(extracted_acc, farmer_acc)
                 if similarity < 90:
                     issues.append(
                         f"Account number mismatch: document shows '{extracted['account_number']}' "
@@ -291,7 +716,7 @@ class ValidationEngine:
         
         # Check name similarity
         if extracted.get('name') and farmer.get('name'):
-            name_sim = self._token_sort_ratio(extracted['name'], farmer['name'])
+            name_sim = _token_sort_ratio(extracted['name'], farmer['name'])
             if name_sim < 70:
                 warnings.append(
                     f"Name partially matches: '{extracted['name']}' vs '{farmer['name']}'"
@@ -304,83 +729,54 @@ class ValidationEngine:
         if not acc:
             return False
         acc_clean = acc.replace(' ', '').replace('-', '')
-        return acc_clean.isdigit() and 9 <= len(acc_clean) <= 18
+        return _all_ascii_digits(acc_clean) and 9 <= len(acc_clean) <= 18
     
     def _validate_ifsc(self, ifsc: str) -> bool:
         """Validate IFSC code format (4 letters + 0 + 6 alphanumeric)."""
         if not ifsc:
             return False
-        return bool(re.match(r'^[A-Z]{4}0[A-Z0-9]{6}$', ifsc.upper()))
+        return bool(_IFSC_RE.match(ifsc.upper()))
     
     def _validate_aadhaar(self, aadhaar: str) -> bool:
         """Validate Aadhaar format (12 digits)."""
         if not aadhaar:
             return False
         aadhaar_clean = aadhaar.replace(' ', '')
-        return aadhaar_clean.isdigit() and len(aadhaar_clean) == 12
+        return _all_ascii_digits(aadhaar_clean) and len(aadhaar_clean) == 12
     
     def _validate_phone(self, phone: str) -> bool:
         """Validate Indian phone number format."""
         if not phone:
             return False
         phone_clean = phone.replace(' ', '').replace('-', '')
-        return bool(re.match(r'^[6-9]\d{9}$', phone_clean))
-
-    def _ratio(self, a: str, b: str) -> int:
-        if self._fuzz:
-            return self._fuzz.ratio(a, b)
-        return _ratio(a, b)
-
-    def _token_sort_ratio(self, a: str, b: str) -> int:
-        if self._fuzz:
-            return self._fuzz.token_sort_ratio(a, b)
-        return _token_sort_ratio(a, b)
+        return bool(_PHONE_RE.match(phone_clean))
     
-    def find_similar_farmers(self, name: str, limit: int = 5) -> List[Dict]:
+    def find_similar_farmers(
+        self,
+        name: str,
+        limit: int = 5,
+        min_similarity: float = 50,
+    ) -> List[Dict]:
         """Find farmers with similar names (for suggestions)."""
-        all_names = []
-        for farmer in self.farmers:
-            if farmer.get('name'):
-                all_names.append((farmer['name'], farmer))
-            if farmer.get('name_en'):
-                all_names.append((farmer['name_en'], farmer))
+        farmers = self.farmers
+        if not farmers:
+            return []
+        # Score name and name_en side by side and keep each farmer's better
+        # one, so every farmer appears at most once without a dedup pass.
+        names = [farmer.get('name') or '' for farmer in farmers]
+        names += [farmer.get('name_en') or '' for farmer in farmers]
+        both = process.cdist([name], names, scorer=fuzz.token_sort_ratio, dtype=np.float64)[0]
+        both[[not n for n in names]] = -1  # missing names never match
+        count = len(farmers)
+        best = np.maximum(both[:count], both[count:])
         
-        if self._process and self._fuzz:
-            matches = self._process.extract(
-                name,
-                [n[0] for n in all_names],
-                scorer=self._fuzz.token_sort_ratio,
-                limit=limit
-            )
-            
-            results = []
-            seen_ids = set()
-            for match_name, score, idx in matches:
-                farmer = all_names[idx][1]
-                if farmer.get('id') not in seen_ids:
-                    results.append({
-                        'farmer': farmer,
-                        'similarity': score
-                    })
-                    seen_ids.add(farmer.get('id'))
-            
-            return results
-
-        scored = []
-        for name_value, farmer in all_names:
-            score = self._token_sort_ratio(name, name_value)
-            scored.append((score, farmer))
-        scored.sort(key=lambda x: x[0], reverse=True)
-
-        results = []
-        seen_ids = set()
-        for score, farmer in scored[:limit]:
-            if farmer.get('id') not in seen_ids:
-                results.append({'farmer': farmer, 'similarity': score})
-                seen_ids.add(farmer.get('id'))
-
-        return results
-
+        hits = np.flatnonzero(best >= min_similarity)
+        # Highest score first; ties keep farmer order.
+        hits = hits[np.argsort(-best[hits], kind='stable')][:limit]
+        return [
+            {'farmer': farmers[i], 'similarity': float(best[i])}
+            for i in hits
+        ]
 
 if __name__ == "__main__":
     # Test with sample data
@@ -0,0 +1,268 @@
+"""
+Equivalence tests for the optimized name matching in validation_engine.
+
+_best_name_match (cdist pruning, score cutoff, Soundex prefilter) and
+validate_batch (chunked scoring) must give the same answers as a plain scan
+of every farmer with the original weighted score.
+
+Run from backend/ with `pytest tests` (or `python -m unittest discover -s tests`).
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from rapidfuzz import fuzz
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import validation_engine  # noqa: E402
+from validation_engine import ValidationEngine, _name_index  # noqa: E402
+
+
+WORDS = [
+    "Rajesh", "Kumar", "Patil", "Sunita", "Devi", "Sharma", "Ramesh", "Pawar",
+    "Anita", "Joshi", "Ganesh", "Shinde", "Meena", "Kale", "Vijay", "Jadhav",
+    "राजेश", "सुनीता", "पाटिल", "देवी",
+]
+
+
+def _digits(value) -> str:
+    return "".join(c for c in str(value) if c.isdigit())
+
+
+def baseline_score(extracted: dict, farmer: dict) -> float:
+    """The weighted score as a straightforward per-farmer computation."""
+    scores = []
+    weights = []
+    if extracted.get("name") and farmer.get("name"):
+        name = extracted["name"].lower()
+        name_score = int(fuzz.token_sort_ratio(name, farmer["name"].lower()))
+        if farmer.get("name_en"):
+            name_score = max(
+                name_score, int(fuzz.token_sort_ratio(name, farmer["name_en"].lower()))
+            )
+        scores.append(name_score)
+        weights.append(2.0)
+    if extracted.get("account_number") and farmer.get("account_number"):
+        a = str(extracted["account_number"]).replace(" ", "").replace("-", "")
+        b = str(farmer["account_number"]).replace(" ", "").replace("-", "")
+        scores.append(100 if a == b else int(fuzz.ratio(a, b)))
+        weights.append(1.5)
+    if extracted.get("survey_number") and farmer.get("survey_number"):
+        scores.append(int(fuzz.ratio(str(extracted["survey_number"]), str(farmer["survey_number"]))))
+        weights.append(1.0)
+    if extracted.get("phone") and farmer.get("phone"):
+        a = _digits(extracted["phone"])[-10:]
+        b = _digits(farmer["phone"])[-10:]
+        scores.append(100 if a == b else int(fuzz.ratio(a, b)))
+        weights.append(1.0)
+    if not scores:
+        return 0
+    return sum(s * w for s, w in zip(scores, weights)) / sum(weights)
+
+
+def baseline_match(extracted: dict, farmers: list) -> tuple:
+    """(farmer, score) of the first farmer with the highest score, or (None, 0)."""
+    best, best_score = None, 0
+    for farmer in farmers:
+        score = baseline_score(extracted, farmer)
+        if score > best_score:
+            best, best_score = farmer, score
+    return best, best_score
+
+
+def random_farmers(rng: random.Random, count: int, prefix: str = "X") -> list:
+    farmers = []
+    for i in range(count):
+        farmer = {"id": f"{prefix}{i:05d}", "name": " ".join(rng.sample(WORDS, rng.randint(0, 3)))}
+        if rng.random() < 0.6:
+            farmer["name_en"] = " ".join(rng.sample(WORDS[:16], rng.randint(1, 3)))
+        if rng.random() < 0.5:
+            farmer["phone"] = str(rng.randint(6000000000, 6000000100))
+        if rng.random() < 0.5:
+            farmer["survey_number"] = f"{rng.randint(1, 30)}/{rng.randint(1, 3)}"
+        if rng.random() < 0.5:
+            farmer["account_number"] = str(rng.randint(10**9, 10**9 + 200))
+        farmers.append(farmer)
+    return farmers
+
+
+def random_query(rng: random.Random) -> dict:
+    query = {"name": " ".join(rng.sample(WORDS, rng.randint(1, 3)))}
+    if rng.random() < 0.5:
+        query["phone"] = str(rng.randint(6000000000, 6000000100))
+    if rng.random() < 0.5:
+        query["survey_number"] = f"{rng.randint(1, 30)}/{rng.randint(1, 3)}"
+    if rng.random() < 0.3:
+        query["account_number"] = str(rng.randint(10**9, 10**9 + 200))
+    return query
+
+
+def misspell(rng: random.Random, name: str) -> str:
+    """name with one letter after each token's first two replaced."""
+    tokens = []
+    for token in name.split():
+        if len(token) > 3:
+            i = rng.randrange(2, len(token))
+            token = token[:i] + rng.choice("aeiouxyz") + token[i + 1:]
+        tokens.append(token)
+    return " ".join(tokens)
+
+
+class BestNameMatchTests(unittest.TestCase):
+
+    def assertSameMatch(self, query, expected, actual):
+        self.assertEqual(
+            (expected[0] or {}).get("id"), (actual[0] or {}).get("id"), query
+        )
+        self.assertAlmostEqual(expected[1], actual[1], places=9, msg=query)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1)
+        farmers = random_farmers(rng, 400)
+        engine = ValidationEngine(farmers)
+        names = _name_index(engine.farmers)
+        for _ in range(1000):
+            query = random_query(rng)
+            self.assertSameMatch(
+                query,
+                baseline_match(query, engine.farmers),
+                engine._best_name_match(query, names),
+            )
+
+    def test_weak_matches_fall_back_to_full_scan(self):
+        # Nothing reaches the threshold, so the score-cutoff pass is
+        # inconclusive and the exact scores of weak names decide.
+        farmers = [
+            {"id": "W1", "name": "Ganesh Shinde", "survey_number": "12/1"},
+            {"id": "W2", "name": "Meena Kale"},
+            {"id": "W3", "name": "", "survey_number": "12/2"},
+        ]
+        engine = ValidationEngine(farmers)
+        for query in (
+            {"name": "Rajesh Patil", "survey_number": "7/3"},
+            {"name": "Mena", "survey_number": "99/9"},
+            {"name": "Zzz"},
+        ):
+            expected = baseline_match(query, engine.farmers)
+            self.assertLess(expected[1], validation_engine._MATCH_THRESHOLD)
+            self.assertSameMatch(query, expected, engine._best_name_match(query, engine._names))
+
+    def test_ties_go_to_the_earlier_farmer(self):
+        farmers = [{"id": f"T{i}", "name": "Sunita Devi"} for i in range(5)]
+        engine = ValidationEngine(farmers)
+        farmer, score = engine._best_name_match({"name": "Devi Sunita"}, engine._names)
+        self.assertEqual(farmer["id"], "T0")
+        self.assertEqual(score, 100)
+
+    def test_phonetic_prefilter_on_large_lists(self):
+        rng = random.Random(2)
+        farmers = random_farmers(rng, validation_engine._PREFILTER_MIN_FARMERS)
+        engine = ValidationEngine(farmers)
+        named = [f for f in engine.farmers if f.get("name")]
+        for _ in range(40):
+            # Misspelt names keep every token's first two letters, so the
+            # farmers they resemble share a key and survive the prefilter.
+            query = {"name": misspell(rng, rng.choice(named)["name"])}
+            if rng.random() < 0.5:
+                query["phone"] = str(rng.randint(6000000000, 6000000100))
+            self.assertSameMatch(
+                query,
+                baseline_match(query, engine.farmers),
+                engine._best_name_match(query, engine._names),
+            )
+
+
+class ValidateBatchTests(unittest.TestCase):
+
+    def test_chunked_batch_matches_validate(self):
+        rng = random.Random(3)
+        farmers = random_farmers(rng, 300)
+        farmers[0]["account_number"] = "1234 5678 9012"
+        rows = [random_query(rng) for _ in range(60)]
+        rows.append({"name": "Nobody", "account_number": "123456789012"})
+        rows.append({"account_number": "1234-5678-9012"})
+        engine = ValidationEngine(farmers)
+        expected = [engine.validate(row) for row in rows]
+
+        choices = 2 * len(engine.farmers)
+        # Room for three rows of scores per chunk.
+        with mock.patch.object(validation_engine, "_BATCH_SCORES_BYTES", 8 * choices * 3):
+            actual = ValidationEngine(farmers).validate_batch(rows)
+
+        self.assertEqual(len(actual), len(expected))
+        for row, a, e in zip(rows, actual, expected):
+            self.assertEqual(a.is_valid, e.is_valid, row)
+            self.assertAlmostEqual(a.confidence, e.confidence, places=9, msg=row)
+            self.assertEqual(
+                (a.matched_farmer or {}).get("id"), (e.matched_farmer or {}).get("id"), row
+            )
+            self.assertEqual(a.issues, e.issues, row)
+            self.assertEqual(a.warnings, e.warnings, row)
+
+
+class ThresholdTests(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ValidationEngine(
+            [{"id": "F1", "name": "Abcde", "account_number": "1234567890"}]
+        )
+
+    def test_match_at_threshold_is_accepted(self):
+        # ratio('abcxy', 'abcde') == 60
+        result = self.engine.validate({"name": "Abcxy"})
+        self.assertEqual(result.confidence * 100, validation_engine._MATCH_THRESHOLD)
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.matched_farmer["id"], "F1")
+        self.assertFalse(any("No confident match" in w for w in result.warnings))
+
+    def test_match_at_threshold_is_cross_validated(self):
+        # Name and account both score 60, so the weighted score is exactly 60.
+        result = self.engine.validate({"name": "Abcxy", "account_number": "1234500000"})
+        self.assertEqual(result.confidence * 100, validation_engine._MATCH_THRESHOLD)
+        self.assertFalse(result.is_valid)
+        self.assertTrue(any("Account number mismatch" in i for i in result.issues))
+
+
+class FormattedIdTests(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = ValidationEngine([
+            {"id": "F1", "name": "Rajesh Patil", "account_number": "1234 5678 9012",
+             "phone": "9876543210"},
+            {"id": "F2", "name": "Sunita Sharma", "account_number": "987654321098",
+             "phone": "+91 98765 43211"},
+        ])
+
+    def test_account_lookup_ignores_spaces_and_dashes(self):
+        for account in ("123456789012", "1234-5678-9012", "1234 5678 9012"):
+            result = self.engine.validate({"account_number": account})
+            self.assertEqual(result.matched_farmer["id"], "F1", account)
+            self.assertTrue(result.is_valid, account)
+
+    def test_formatted_account_is_not_a_mismatch(self):
+        result = self.engine.validate(
+            {"name": "Sunita Sharma", "account_number": "9876 5432 1098"}
+        )
+        self.assertEqual(result.matched_farmer["id"], "F2")
+        self.assertEqual(result.issues, [])
+        self.assertEqual(result.warnings, [])
+
+    def test_phone_prefixes_match_and_validate(self):
+        for phone in ("+91 98765 43210", "098765-43210", "919876543210"):
+            query = {"name": "Rajesh Patl", "phone": phone}
+            result = self.engine.validate(query)
+            self.assertEqual(result.matched_farmer["id"], "F1", phone)
+            self.assertEqual(result.issues, [], phone)
+            self.assertAlmostEqual(
+                result.confidence * 100,
+                baseline_score(query, self.engine.farmers[0]),
+                places=9,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,7 @@ interface QualityResult {
   blur_score: number
   brightness_score: number
   glare_score: number
-  angle_score: number
+  angle_score: number | null
   resolution_ok: boolean
   issues: string[]
   suggestions: string[]
@@ -411,10 +411,10 @@ export default function Home() {
                     { label: 'Glare', score: result.quality.glare_score },
                     { label: 'Alignment', score: result.quality.angle_score },
                   ].map(({ label, score }) => (
-                    <div key={label} className={`p-3 rounded-lg ${getScoreBg(score)}`}>
+                    <div key={label} className={`p-3 rounded-lg ${score === null ? 'bg-gray-100' : getScoreBg(score)}`}>
                       <div className="text-sm text-gray-600">{label}</div>
-                      <div className={`text-2xl font-bold ${getScoreColor(score)}`}>
-                        {score.toFixed(0)}
+                      <div className={`text-2xl font-bold ${score === null ? 'text-gray-400' : getScoreColor(score)}`}>
+                        {score === null ? '—' : score.toFixed(0)}
                       </div>
                     </div>
                   ))}